@@ -12,28 +12,21 @@ Usage:
     ableton-cli range <start> <len> Set export range in beats
     ableton-cli prepare <index>     Prepare track for export
     ableton-cli export [options]    Export a track
+    ableton-cli --persist           Read commands from stdin, one per line
 
 macOS only - uses AppleScript for GUI automation.
 """
 
 import argparse
-import platform
 import sys
-from typing import Optional
-
-from core import (
-    get_osc_client,
-    check_connection,
-    get_all_tracks,
-    get_groups,
-    get_track_details,
-    find_tracks_by_name,
-    select_track_by_index,
-    set_export_range,
-    prepare_track_for_export,
-    export_track,
-    TrackType,
-)
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from core import ConnectionStatus
+
+# Handlers import from `core` locally so that --help and argument errors
+# return without loading the OSC/AppleScript stack.
 
 
 # Exit codes
@@ -41,11 +34,51 @@ EXIT_SUCCESS = 0
 EXIT_ERROR = 1
 EXIT_CONNECTION_FAILED = 2
 
+# Track listings are flushed to stdout every this many lines
+_FLUSH_LINES = 64
+
+# How long a successful connection check is trusted, in seconds
+_CONNECTION_TTL = 2.0
+
+# (checked_at, client, status) of the last successful connection check
+_connection_cache: Optional[tuple[float, object, "ConnectionStatus"]] = None
+
+
+def _cached_check(client: object, refresh: bool = False) -> "ConnectionStatus":
+    """
+    Check the connection, reusing a recent successful result for the same client.
+
+    Only connected statuses are cached, so a failure is always re-checked on
+    the next command. With refresh=True Live is always queried; commands
+    that change the set or export from it use that, so they never act on a
+    stale tempo or track count.
+    """
+    global _connection_cache
+    from core import check_connection
+
+    now = time.monotonic()
+    if _connection_cache is not None and not refresh:
+        checked_at, cached_client, status = _connection_cache
+        if cached_client is client and now - checked_at < _CONNECTION_TTL:
+            return status
+
+    status = check_connection(client)
+    _connection_cache = (now, client, status) if status.connected else None
+    return status
+
+
+def _forget_connection() -> None:
+    """Drop the cached connection status after Live stopped answering."""
+    global _connection_cache
+    _connection_cache = None
+
 
 def cmd_status(args: argparse.Namespace) -> int:
     """Check connection to Ableton Live."""
+    from core import get_osc_client
+
     client = get_osc_client()
-    status = check_connection(client)
+    status = _cached_check(client, refresh=True)
 
     print(status.message)
     return EXIT_SUCCESS if status.connected else EXIT_CONNECTION_FAILED
@@ -53,61 +86,83 @@ def cmd_status(args: argparse.Namespace) -> int:
 
 def cmd_tracks(args: argparse.Namespace) -> int:
     """List all tracks."""
+    from core import (
+        get_osc_client,
+        try_get_track_count,
+        iter_all_tracks,
+        DISCONNECTED_MESSAGE,
+        TrackType,
+    )
+
     client = get_osc_client()
-    status = check_connection(client)
+    count = try_get_track_count(client)
 
-    if not status.connected:
-        print(f"Error: {status.message}", file=sys.stderr)
+    if count is None:
+        _forget_connection()
+        print(f"Error: {DISCONNECTED_MESSAGE}", file=sys.stderr)
         return EXIT_CONNECTION_FAILED
 
-    tracks = get_all_tracks(client, include_clips=args.clips)
-
-    if not tracks:
+    if not count:
         print("No tracks found. Is a Live Set open?")
         return EXIT_SUCCESS
 
-    print(f"Found {len(tracks)} tracks:\n")
-    for track in tracks:
-        prefix = "GROUP" if track.track_type == TrackType.GROUP else "     "
+    # Print tracks as they arrive, in batches rather than one write per track
+    group = TrackType.GROUP
+    show_clips = args.clips
+    write = sys.stdout.write
+    write(f"Found {count} tracks:\n\n")
+    lines = []
+    for track in iter_all_tracks(client, include_clips=show_clips, track_count=count):
+        prefix = "GROUP" if track.track_type == group else "     "
         muted = " [MUTED]" if track.muted else ""
-        clips = f" ({track.clip_count} clips)" if args.clips and track.clip_count > 0 else ""
-        print(f"[{track.index:3d}] {prefix} {track.name}{muted}{clips}")
+        clips = f" ({track.clip_count} clips)" if show_clips and track.clip_count > 0 else ""
+        lines.append(f"[{track.index:3d}] {prefix} {track.name}{muted}{clips}\n")
+        if len(lines) >= _FLUSH_LINES:
+            write("".join(lines))
+            sys.stdout.flush()
+            lines.clear()
+    write("".join(lines))
 
     return EXIT_SUCCESS
 
 
 def cmd_groups(args: argparse.Namespace) -> int:
     """List all group tracks."""
+    from core import get_osc_client, get_all_tracks_or_error, get_groups, ConnectionStatus
+
     client = get_osc_client()
-    status = check_connection(client)
+    tracks = get_all_tracks_or_error(client)
 
-    if not status.connected:
-        print(f"Error: {status.message}", file=sys.stderr)
+    if isinstance(tracks, ConnectionStatus):
+        _forget_connection()
+        print(f"Error: {tracks.message}", file=sys.stderr)
         return EXIT_CONNECTION_FAILED
 
-    groups = get_groups(client)
+    groups = get_groups(client, tracks=tracks)
 
     if not groups:
         print("No groups found in this Live Set.")
         return EXIT_SUCCESS
 
-    print(f"Found {len(groups)} groups:\n")
-    for group in groups:
-        print(f"[{group.index:3d}] {group.name}")
+    lines = [f"Found {len(groups)} groups:\n\n"]
+    lines.extend(f"[{group.index:3d}] {group.name}\n" for group in groups)
+    sys.stdout.write("".join(lines))
 
     return EXIT_SUCCESS
 
 
 def cmd_info(args: argparse.Namespace) -> int:
     """Get info about a specific track."""
+    from core import get_osc_client, get_track_details
+
     client = get_osc_client()
-    status = check_connection(client)
+    status = _cached_check(client)
 
     if not status.connected:
         print(f"Error: {status.message}", file=sys.stderr)
         return EXIT_CONNECTION_FAILED
 
-    track = get_track_details(client, args.index)
+    track = get_track_details(client, args.index, track_count=status.track_count)
 
     if track is None:
         print(f"Error: Invalid track index {args.index}", file=sys.stderr)
@@ -126,65 +181,86 @@ def cmd_info(args: argparse.Namespace) -> int:
 
 def cmd_find(args: argparse.Namespace) -> int:
     """Find tracks by name."""
+    from core import (
+        get_osc_client,
+        try_get_track_count,
+        find_tracks_by_name,
+        DISCONNECTED_MESSAGE,
+        TrackType,
+    )
+
     client = get_osc_client()
-    status = check_connection(client)
+    count = try_get_track_count(client)
 
-    if not status.connected:
-        print(f"Error: {status.message}", file=sys.stderr)
+    if count is None:
+        _forget_connection()
+        print(f"Error: {DISCONNECTED_MESSAGE}", file=sys.stderr)
         return EXIT_CONNECTION_FAILED
 
-    matches = find_tracks_by_name(client, args.name)
+    matches = find_tracks_by_name(client, args.name, track_count=count)
 
     if not matches:
         print(f"No tracks found matching '{args.name}'")
         return EXIT_SUCCESS
 
-    print(f"Found {len(matches)} matches:\n")
+    group = TrackType.GROUP
+    lines = [f"Found {len(matches)} matches:\n\n"]
     for track in matches:
-        prefix = "GROUP" if track.track_type == TrackType.GROUP else "track"
-        print(f"[{track.index:3d}] {prefix}: {track.name}")
+        prefix = "GROUP" if track.track_type == group else "track"
+        lines.append(f"[{track.index:3d}] {prefix}: {track.name}\n")
+    sys.stdout.write("".join(lines))
 
     return EXIT_SUCCESS
 
 
 def cmd_select(args: argparse.Namespace) -> int:
     """Select a track."""
+    from core import get_osc_client, select_track_by_index
+
     client = get_osc_client()
-    status = check_connection(client)
+    status = _cached_check(client, refresh=True)
 
     if not status.connected:
         print(f"Error: {status.message}", file=sys.stderr)
         return EXIT_CONNECTION_FAILED
 
-    success, message = select_track_by_index(client, args.index)
+    success, message = select_track_by_index(
+        client, args.index, track_count=status.track_count
+    )
     print(message)
     return EXIT_SUCCESS if success else EXIT_ERROR
 
 
 def cmd_range(args: argparse.Namespace) -> int:
     """Set export range."""
+    from core import get_osc_client, set_export_range
+
     client = get_osc_client()
-    status = check_connection(client)
+    status = _cached_check(client, refresh=True)
 
     if not status.connected:
         print(f"Error: {status.message}", file=sys.stderr)
         return EXIT_CONNECTION_FAILED
 
-    message = set_export_range(client, args.start, args.length)
+    message = set_export_range(client, args.start, args.length, tempo=status.tempo)
     print(message)
     return EXIT_SUCCESS
 
 
 def cmd_prepare(args: argparse.Namespace) -> int:
     """Prepare track for export."""
+    from core import get_osc_client, prepare_track_for_export
+
     client = get_osc_client()
-    status = check_connection(client)
+    status = _cached_check(client, refresh=True)
 
     if not status.connected:
         print(f"Error: {status.message}", file=sys.stderr)
         return EXIT_CONNECTION_FAILED
 
-    success, message = prepare_track_for_export(client, args.index)
+    success, message = prepare_track_for_export(
+        client, args.index, tempo=status.tempo, track_count=status.track_count
+    )
     print(message)
 
     if success:
@@ -195,12 +271,15 @@ def cmd_prepare(args: argparse.Namespace) -> int:
 
 def cmd_export(args: argparse.Namespace) -> int:
     """Export a track."""
-    if platform.system() != "Darwin":
+    # Fail fast, before importing core or opening the OSC connection
+    if sys.platform != "darwin":
         print("Error: Export is only supported on macOS", file=sys.stderr)
         return EXIT_ERROR
 
+    from core import get_osc_client, export_track
+
     client = get_osc_client()
-    status = check_connection(client)
+    status = _cached_check(client, refresh=True)
 
     if not status.connected:
         print(f"Error: {status.message}", file=sys.stderr)
@@ -213,6 +292,8 @@ def cmd_export(args: argparse.Namespace) -> int:
         track_index=track_index,
         output_folder=args.output,
         custom_filename=args.filename,
+        tempo=status.tempo,
+        track_count=status.track_count,
     )
 
     if result.success:
@@ -223,29 +304,25 @@ def cmd_export(args: argparse.Namespace) -> int:
     return EXIT_SUCCESS if result.success else EXIT_ERROR
 
 
-def create_parser() -> argparse.ArgumentParser:
-    """Create the argument parser."""
-    parser = argparse.ArgumentParser(
-        prog="ableton-cli",
-        description="Control Ableton Live from the command line",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  ableton-cli status                    Check connection
-  ableton-cli tracks --clips            List tracks with clip counts
-  ableton-cli find "bass"               Find tracks containing "bass"
-  ableton-cli export --track 5          Export track 5 with auto-generated name
-  ableton-cli export --track 5 -o ~/exports -f my_bass
-                                        Export track 5 to ~/exports/my_bass.wav
-""",
-    )
+# Command dispatch
+_COMMANDS: dict[str, Callable[[argparse.Namespace], int]] = {
+    "status": cmd_status,
+    "tracks": cmd_tracks,
+    "groups": cmd_groups,
+    "info": cmd_info,
+    "find": cmd_find,
+    "select": cmd_select,
+    "range": cmd_range,
+    "prepare": cmd_prepare,
+    "export": cmd_export,
+}
 
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
-    # status
+def _build_status(subparsers: "argparse._SubParsersAction") -> None:
     subparsers.add_parser("status", help="Check connection to Ableton Live")
 
-    # tracks
+
+def _build_tracks(subparsers: "argparse._SubParsersAction") -> None:
     tracks_parser = subparsers.add_parser("tracks", help="List all tracks")
     tracks_parser.add_argument(
         "--clips", "-c",
@@ -253,31 +330,38 @@ Examples:
         help="Include clip count for each track",
     )
 
-    # groups
+
+def _build_groups(subparsers: "argparse._SubParsersAction") -> None:
     subparsers.add_parser("groups", help="List all group tracks")
 
-    # info
+
+def _build_info(subparsers: "argparse._SubParsersAction") -> None:
     info_parser = subparsers.add_parser("info", help="Get info about a specific track")
     info_parser.add_argument("index", type=int, help="Track index (0-based)")
 
-    # find
+
+def _build_find(subparsers: "argparse._SubParsersAction") -> None:
     find_parser = subparsers.add_parser("find", help="Find tracks by name")
     find_parser.add_argument("name", help="Text to search for in track names")
 
-    # select
+
+def _build_select(subparsers: "argparse._SubParsersAction") -> None:
     select_parser = subparsers.add_parser("select", help="Select a track")
     select_parser.add_argument("index", type=int, help="Track index (0-based)")
 
-    # range
+
+def _build_range(subparsers: "argparse._SubParsersAction") -> None:
     range_parser = subparsers.add_parser("range", help="Set export range in beats")
     range_parser.add_argument("start", type=float, help="Start position in beats")
     range_parser.add_argument("length", type=float, help="Length in beats")
 
-    # prepare
+
+def _build_prepare(subparsers: "argparse._SubParsersAction") -> None:
     prepare_parser = subparsers.add_parser("prepare", help="Prepare track for export")
     prepare_parser.add_argument("index", type=int, help="Track index (0-based)")
 
-    # export
+
+def _build_export(subparsers: "argparse._SubParsersAction") -> None:
     export_parser = subparsers.add_parser("export", help="Export a track")
     export_parser.add_argument(
         "--track", "-t",
@@ -293,36 +377,256 @@ Examples:
         help="Custom filename without extension (auto-generated if not specified)",
     )
 
+
+# Subparser builders in help order
+_SUBPARSER_BUILDERS = {
+    "status": _build_status,
+    "tracks": _build_tracks,
+    "groups": _build_groups,
+    "info": _build_info,
+    "find": _build_find,
+    "select": _build_select,
+    "range": _build_range,
+    "prepare": _build_prepare,
+    "export": _build_export,
+}
+
+
+_EPILOG = """
+Examples:
+  ableton-cli status                    Check connection
+  ableton-cli tracks --clips            List tracks with clip counts
+  ableton-cli find "bass"               Find tracks containing "bass"
+  ableton-cli export --track 5          Export track 5 with auto-generated name
+  ableton-cli export --track 5 -o ~/exports -f my_bass
+                                        Export track 5 to ~/exports/my_bass.wav
+  ableton-cli --persist                 Read commands from stdin, one per line,
+                                        reusing a single connection to Live
+"""
+
+
+def _requested_command(argv: list[str]) -> Optional[str]:
+    """
+    Peek at argv for the subcommand, without parsing it.
+
+    Returns None for help requests and unknown or missing commands, so the
+    caller can fall back to registering every subparser.
+    """
+    for token in argv:
+        if token in ("-h", "--help"):
+            return None
+        if not token.startswith("-"):
+            return token if token in _SUBPARSER_BUILDERS else None
+    return None
+
+
+def create_parser(argv: Optional[list[str]] = None) -> argparse.ArgumentParser:
+    """
+    Create the argument parser.
+
+    Args:
+        argv: Arguments about to be parsed. If they name a known subcommand,
+              only that subparser is registered; otherwise all of them are, so
+              help output and "invalid choice" errors list every command.
+    """
+    parser = argparse.ArgumentParser(
+        prog="ableton-cli",
+        description="Control Ableton Live from the command line",
+    )
+    if argv is None or not argv or "-h" in argv or "--help" in argv:
+        # The examples only matter when help is going to be printed
+        parser.formatter_class = argparse.RawDescriptionHelpFormatter
+        parser.epilog = _EPILOG
+
+    parser.add_argument(
+        "--persist",
+        action="store_true",
+        help="Read commands from stdin, one per line, reusing one connection to Live",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    command = _requested_command(argv) if argv is not None else None
+    if command is not None:
+        _SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for build in _SUBPARSER_BUILDERS.values():
+            build(subparsers)
+
     return parser
 
 
-def main(argv: Optional[list[str]] = None) -> int:
-    """Main entry point."""
-    parser = create_parser()
-    args = parser.parse_args(argv)
+def _fast_no_args(rest: list[str]) -> Optional[argparse.Namespace]:
+    return argparse.Namespace() if not rest else None
+
+
+def _fast_tracks(rest: list[str]) -> Optional[argparse.Namespace]:
+    if any(token not in ("--clips", "-c") for token in rest):
+        return None
+    return argparse.Namespace(clips=bool(rest))
+
+
+def _fast_index(rest: list[str]) -> Optional[argparse.Namespace]:
+    if len(rest) != 1:
+        return None
+    try:
+        return argparse.Namespace(index=int(rest[0]))
+    except ValueError:
+        return None
+
+
+def _fast_find(rest: list[str]) -> Optional[argparse.Namespace]:
+    if len(rest) != 1 or rest[0].startswith("-"):
+        return None
+    return argparse.Namespace(name=rest[0])
+
+
+def _fast_range(rest: list[str]) -> Optional[argparse.Namespace]:
+    if len(rest) != 2:
+        return None
+    try:
+        return argparse.Namespace(start=float(rest[0]), length=float(rest[1]))
+    except ValueError:
+        return None
+
+
+_EXPORT_OPTIONS = {
+    "--track": "track", "-t": "track",
+    "--output": "output", "-o": "output",
+    "--filename": "filename", "-f": "filename",
+}
+
+
+def _fast_export(rest: list[str]) -> Optional[argparse.Namespace]:
+    values: dict[str, Optional[str]] = {"track": None, "output": None, "filename": None}
+    tokens = iter(rest)
+    for token in tokens:
+        dest = _EXPORT_OPTIONS.get(token)
+        value = next(tokens, None)
+        if dest is None or value is None or value.startswith("-"):
+            return None
+        values[dest] = value
+
+    track: Optional[int] = None
+    if values["track"] is not None:
+        try:
+            track = int(values["track"])
+        except ValueError:
+            return None
+    return argparse.Namespace(track=track, output=values["output"], filename=values["filename"])
+
+
+# Parsers for the plain invocations of each command. They return None for
+# anything they don't recognise (help flags, bad values, --opt=value forms)
+# so that argparse can handle it and produce its usual messages.
+_FAST_PARSERS = {
+    "status": _fast_no_args,
+    "tracks": _fast_tracks,
+    "groups": _fast_no_args,
+    "info": _fast_index,
+    "find": _fast_find,
+    "select": _fast_index,
+    "range": _fast_range,
+    "prepare": _fast_index,
+    "export": _fast_export,
+}
+
+
+def _fast_parse(argv: list[str]) -> Optional[argparse.Namespace]:
+    """Parse common invocations without building an argparse parser."""
+    if not argv:
+        return None
+    fast = _FAST_PARSERS.get(argv[0])
+    if fast is None:
+        return None
+    args = fast(argv[1:])
+    if args is not None:
+        args.command = argv[0]
+        args.persist = False
+    return args
+
+
+def _run_persist() -> int:
+    """
+    Run commands read from stdin until EOF or "quit".
+
+    Every command shares the process-wide OSC client, so a batch of commands
+    pays for connection setup once. Returns the exit code of the last command.
+    """
+    import shlex
+
+    interactive = sys.stdin.isatty()
+    result = EXIT_SUCCESS
+
+    while True:
+        if interactive:
+            print("ableton> ", end="", file=sys.stderr, flush=True)
+        line = sys.stdin.readline()
+        if not line:
+            break
+
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            result = EXIT_ERROR
+            continue
+
+        if not argv:
+            continue
+        if argv[0] in ("quit", "exit"):
+            break
+
+        try:
+            result = main(argv)
+        except SystemExit as e:
+            # argparse exits on --help and usage errors; keep the session alive
+            result = e.code if isinstance(e.code, int) else EXIT_ERROR
+        except Exception as e:
+            # A failed command (export error, lost connection, ...) shouldn't
+            # end the session either
+            print(f"Error: {e}", file=sys.stderr)
+            result = EXIT_ERROR
+
+    return result
 
-    if not args.command:
-        parser.print_help()
-        return EXIT_SUCCESS
 
-    # Command dispatch
-    commands = {
-        "status": cmd_status,
-        "tracks": cmd_tracks,
-        "groups": cmd_groups,
-        "info": cmd_info,
-        "find": cmd_find,
-        "select": cmd_select,
-        "range": cmd_range,
-        "prepare": cmd_prepare,
-        "export": cmd_export,
-    }
-
-    handler = commands.get(args.command)
+def main(argv: Optional[list[str]] = None) -> int:
+    """Main entry point."""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    args = _fast_parse(argv)
+    if args is None:
+        parser = create_parser(argv)
+        args = parser.parse_args(argv)
+
+        if args.persist:
+            if args.command:
+                parser.error("--persist reads its commands from stdin")
+            return _run_persist()
+
+        if not args.command:
+            parser.print_help()
+            return EXIT_SUCCESS
+
+    # Command names come straight from argv on both the fast and argparse
+    # paths and aren't interned; interning lets the lookup against the
+    # literal (interned) _COMMANDS keys succeed on the identity check
+    handler = _COMMANDS.get(sys.intern(args.command))
     if handler:
-        return handler(args)
+        try:
+            result = handler(args)
+        except Exception:
+            _forget_connection()
+            raise
+        if result != EXIT_SUCCESS:
+            # A timed-out query looks like any other failure from here, so
+            # don't trust the cached status for the next command
+            _forget_connection()
+        return result
     else:
-        parser.print_help()
+        create_parser().print_help()
         return EXIT_ERROR
 
 
@@ -11,6 +11,7 @@ from io import StringIO
 from cli import (
     main,
     create_parser,
+    _fast_parse,
     EXIT_SUCCESS,
     EXIT_ERROR,
     EXIT_CONNECTION_FAILED,
@@ -64,12 +65,75 @@ class TestParser(unittest.TestCase):
         self.assertEqual(args.output, "/tmp")
         self.assertEqual(args.filename, "test")
 
+    def test_parser_for_argv_registers_only_requested_command(self) -> None:
+        """create_parser(argv) should only build the subparser argv names."""
+        parser = create_parser(["info", "3"])
+        args = parser.parse_args(["info", "3"])
+        self.assertEqual(args.index, 3)
+        with self.assertRaises(SystemExit):
+            with patch("sys.stderr", new_callable=StringIO):
+                parser.parse_args(["tracks"])
+
+    def test_epilog_only_when_help_requested(self) -> None:
+        """Examples should be attached for help output only."""
+        self.assertIsNone(create_parser(["info", "3"]).epilog)
+        self.assertIn("Examples:", create_parser(["--help"]).epilog)
+        self.assertIn("Examples:", create_parser([]).epilog)
+
+    def test_parser_for_unknown_command_registers_all(self) -> None:
+        """Unknown commands should still get the full list of choices."""
+        parser = create_parser(["bogus"])
+        with patch("sys.stderr", new_callable=StringIO) as stderr:
+            with self.assertRaises(SystemExit):
+                parser.parse_args(["bogus"])
+        self.assertIn("export", stderr.getvalue())
+
+
+class TestFastParse(unittest.TestCase):
+    """Test the argparse-free fast path."""
+
+    def test_matches_argparse_for_common_invocations(self) -> None:
+        """Fast-parsed namespaces should equal what argparse produces."""
+        invocations = [
+            ["status"],
+            ["tracks"],
+            ["tracks", "-c"],
+            ["groups"],
+            ["info", "3"],
+            ["find", "bass"],
+            ["select", "0"],
+            ["range", "0", "64.5"],
+            ["prepare", "2"],
+            ["export"],
+            ["export", "-t", "5", "--output", "/tmp", "-f", "bass"],
+        ]
+        for argv in invocations:
+            with self.subTest(argv=argv):
+                expected = create_parser().parse_args(argv)
+                self.assertEqual(_fast_parse(argv), expected)
+
+    def test_defers_to_argparse_when_unsure(self) -> None:
+        """Help flags, bad values and unknown options should fall through."""
+        for argv in [
+            [],
+            ["--help"],
+            ["tracks", "--help"],
+            ["info", "three"],
+            ["info"],
+            ["find", "-x"],
+            ["export", "--track=5"],
+            ["export", "--track"],
+            ["bogus"],
+        ]:
+            with self.subTest(argv=argv):
+                self.assertIsNone(_fast_parse(argv))
+
 
 class TestStatusCommand(unittest.TestCase):
     """Test status command."""
 
-    @patch("cli.check_connection")
-    @patch("cli.get_osc_client")
+    @patch("core.check_connection")
+    @patch("core.get_osc_client")
     def test_status_connected(
         self, mock_client: MagicMock, mock_test: MagicMock
     ) -> None:
@@ -85,8 +149,8 @@ class TestStatusCommand(unittest.TestCase):
 
         self.assertEqual(result, EXIT_SUCCESS)
 
-    @patch("cli.check_connection")
-    @patch("cli.get_osc_client")
+    @patch("core.check_connection")
+    @patch("core.get_osc_client")
     def test_status_disconnected(
         self, mock_client: MagicMock, mock_test: MagicMock
     ) -> None:
@@ -104,74 +168,87 @@ class TestStatusCommand(unittest.TestCase):
 class TestTracksCommand(unittest.TestCase):
     """Test tracks command."""
 
-    @patch("cli.get_all_tracks")
-    @patch("cli.check_connection")
-    @patch("cli.get_osc_client")
+    @patch("core.iter_all_tracks")
+    @patch("core.try_get_track_count")
+    @patch("core.get_osc_client")
     def test_tracks_lists_all(
         self,
         mock_client: MagicMock,
-        mock_test: MagicMock,
+        mock_count: MagicMock,
         mock_tracks: MagicMock,
     ) -> None:
         """tracks should list all tracks."""
-        mock_test.return_value = ConnectionStatus(connected=True, message="OK")
-        mock_tracks.return_value = [
+        mock_count.return_value = 2
+        mock_tracks.return_value = iter([
             TrackInfo(0, "Bass", TrackType.TRACK, False),
             TrackInfo(1, "Drums", TrackType.GROUP, True),
-        ]
+        ])
 
-        result = main(["tracks"])
+        with patch("sys.stdout", new_callable=StringIO) as stdout:
+            result = main(["tracks"])
 
         self.assertEqual(result, EXIT_SUCCESS)
         mock_tracks.assert_called_once()
+        self.assertEqual(mock_tracks.call_args.kwargs["track_count"], 2)
+        self.assertEqual(
+            stdout.getvalue(),
+            "Found 2 tracks:\n\n"
+            "[  0]       Bass\n"
+            "[  1] GROUP Drums [MUTED]\n",
+        )
 
-    @patch("cli.check_connection")
-    @patch("cli.get_osc_client")
+    @patch("core.iter_all_tracks")
+    @patch("core.try_get_track_count")
+    @patch("core.get_osc_client")
     def test_tracks_handles_disconnection(
-        self, mock_client: MagicMock, mock_test: MagicMock
+        self,
+        mock_client: MagicMock,
+        mock_count: MagicMock,
+        mock_tracks: MagicMock,
     ) -> None:
         """tracks should handle disconnection."""
-        mock_test.return_value = ConnectionStatus(
-            connected=False,
-            message="Not connected",
-        )
+        mock_count.return_value = None
 
-        result = main(["tracks"])
+        with patch("sys.stderr", new_callable=StringIO):
+            result = main(["tracks"])
 
         self.assertEqual(result, EXIT_CONNECTION_FAILED)
+        mock_tracks.assert_not_called()
 
 
 class TestFindCommand(unittest.TestCase):
     """Test find command."""
 
-    @patch("cli.find_tracks_by_name")
-    @patch("cli.check_connection")
-    @patch("cli.get_osc_client")
+    @patch("core.find_tracks_by_name")
+    @patch("core.try_get_track_count")
+    @patch("core.get_osc_client")
     def test_find_returns_matches(
         self,
         mock_client: MagicMock,
-        mock_test: MagicMock,
+        mock_count: MagicMock,
         mock_find: MagicMock,
     ) -> None:
         """find should return matching tracks."""
-        mock_test.return_value = ConnectionStatus(connected=True, message="OK")
+        mock_count.return_value = 6
         mock_find.return_value = [
             TrackInfo(0, "Bass", TrackType.TRACK, False),
             TrackInfo(5, "Sub Bass", TrackType.TRACK, False),
         ]
 
-        result = main(["find", "bass"])
+        with patch("sys.stdout", new_callable=StringIO):
+            result = main(["find", "bass"])
 
         self.assertEqual(result, EXIT_SUCCESS)
         mock_find.assert_called_once()
+        self.assertEqual(mock_find.call_args.kwargs["track_count"], 6)
 
 
 class TestSelectCommand(unittest.TestCase):
     """Test select command."""
 
-    @patch("cli.select_track_by_index")
-    @patch("cli.check_connection")
-    @patch("cli.get_osc_client")
+    @patch("core.select_track_by_index")
+    @patch("core.check_connection")
+    @patch("core.get_osc_client")
     def test_select_success(
         self,
         mock_client: MagicMock,
@@ -186,9 +263,9 @@ class TestSelectCommand(unittest.TestCase):
 
         self.assertEqual(result, EXIT_SUCCESS)
 
-    @patch("cli.select_track_by_index")
-    @patch("cli.check_connection")
-    @patch("cli.get_osc_client")
+    @patch("core.select_track_by_index")
+    @patch("core.check_connection")
+    @patch("core.get_osc_client")
     def test_select_invalid_index(
         self,
         mock_client: MagicMock,
@@ -207,19 +284,17 @@ class TestSelectCommand(unittest.TestCase):
 class TestExportCommand(unittest.TestCase):
     """Test export command."""
 
-    @patch("cli.platform")
-    @patch("cli.export_track")
-    @patch("cli.check_connection")
-    @patch("cli.get_osc_client")
+    @patch("cli.sys.platform", "darwin")
+    @patch("core.export_track")
+    @patch("core.check_connection")
+    @patch("core.get_osc_client")
     def test_export_success(
         self,
         mock_client: MagicMock,
         mock_test: MagicMock,
         mock_export: MagicMock,
-        mock_platform: MagicMock,
     ) -> None:
         """export should succeed on macOS."""
-        mock_platform.system.return_value = "Darwin"
         mock_test.return_value = ConnectionStatus(connected=True, message="OK")
         mock_export.return_value = ExportResult(
             success=True,
@@ -231,28 +306,37 @@ class TestExportCommand(unittest.TestCase):
 
         self.assertEqual(result, EXIT_SUCCESS)
 
-    @patch("cli.platform")
-    def test_export_fails_on_non_macos(self, mock_platform: MagicMock) -> None:
+    @patch("cli.sys.platform", "linux")
+    def test_export_fails_on_non_macos(self) -> None:
         """export should fail on non-macOS."""
-        mock_platform.system.return_value = "Linux"
-
         result = main(["export"])
 
         self.assertEqual(result, EXIT_ERROR)
 
-    @patch("cli.platform")
-    @patch("cli.export_track")
-    @patch("cli.check_connection")
-    @patch("cli.get_osc_client")
+    @patch("cli.sys.platform", "linux")
+    @patch("core.check_connection")
+    @patch("core.get_osc_client")
+    def test_export_fails_on_non_macos_before_connecting(
+        self, mock_client: MagicMock, mock_test: MagicMock
+    ) -> None:
+        """export should reject non-macOS without touching OSC."""
+        result = main(["export", "--track", "5"])
+
+        self.assertEqual(result, EXIT_ERROR)
+        mock_client.assert_not_called()
+        mock_test.assert_not_called()
+
+    @patch("cli.sys.platform", "darwin")
+    @patch("core.export_track")
+    @patch("core.check_connection")
+    @patch("core.get_osc_client")
     def test_export_failure(
         self,
         mock_client: MagicMock,
         mock_test: MagicMock,
         mock_export: MagicMock,
-        mock_platform: MagicMock,
     ) -> None:
         """export should return error on failure."""
-        mock_platform.system.return_value = "Darwin"
         mock_test.return_value = ConnectionStatus(connected=True, message="OK")
         mock_export.return_value = ExportResult(
             success=False,
@@ -265,6 +349,139 @@ class TestExportCommand(unittest.TestCase):
         self.assertEqual(result, EXIT_ERROR)
 
 
+class TestPersistMode(unittest.TestCase):
+    """Test --persist mode."""
+
+    @patch("core.check_connection")
+    @patch("core.get_osc_client")
+    def test_runs_each_line_as_a_command(
+        self, mock_client: MagicMock, mock_test: MagicMock
+    ) -> None:
+        """--persist should run commands from stdin until EOF."""
+        mock_test.return_value = ConnectionStatus(connected=True, message="OK")
+
+        with patch("sys.stdin", StringIO("status\n\nstatus\n")), \
+                patch("sys.stdout", new_callable=StringIO):
+            result = main(["--persist"])
+
+        self.assertEqual(result, EXIT_SUCCESS)
+        self.assertEqual(mock_test.call_count, 2)
+
+    @patch("core.get_track_details")
+    @patch("core.check_connection")
+    @patch("core.get_osc_client")
+    def test_connection_check_is_reused_between_commands(
+        self,
+        mock_client: MagicMock,
+        mock_test: MagicMock,
+        mock_details: MagicMock,
+    ) -> None:
+        """Back-to-back read-only commands should share one connection check."""
+        mock_test.return_value = ConnectionStatus(connected=True, message="OK")
+        mock_details.return_value = TrackInfo(0, "Bass", TrackType.TRACK, False)
+
+        with patch("sys.stdin", StringIO("info 0\ninfo 1\n")), \
+                patch("sys.stdout", new_callable=StringIO):
+            main(["--persist"])
+
+        self.assertEqual(mock_test.call_count, 1)
+        self.assertEqual(mock_details.call_count, 2)
+
+    @patch("core.select_track_by_index")
+    @patch("core.get_track_details")
+    @patch("core.check_connection")
+    @patch("core.get_osc_client")
+    def test_mutating_commands_query_fresh_status(
+        self,
+        mock_client: MagicMock,
+        mock_test: MagicMock,
+        mock_details: MagicMock,
+        mock_select: MagicMock,
+    ) -> None:
+        """select should act on a fresh track count, not a cached one."""
+        mock_test.side_effect = [
+            ConnectionStatus(connected=True, track_count=4, message="OK"),
+            ConnectionStatus(connected=True, track_count=5, message="OK"),
+        ]
+        mock_details.return_value = TrackInfo(0, "Bass", TrackType.TRACK, False)
+        mock_select.return_value = (True, "Selected")
+
+        with patch("sys.stdin", StringIO("info 0\nselect 4\n")), \
+                patch("sys.stdout", new_callable=StringIO):
+            main(["--persist"])
+
+        self.assertEqual(mock_test.call_count, 2)
+        self.assertEqual(mock_select.call_args.kwargs["track_count"], 5)
+
+    @patch("core.get_track_details")
+    @patch("core.check_connection")
+    @patch("core.get_osc_client")
+    def test_failed_command_drops_cached_status(
+        self,
+        mock_client: MagicMock,
+        mock_test: MagicMock,
+        mock_details: MagicMock,
+    ) -> None:
+        """A command that failed should make the next one re-check Live."""
+        mock_test.return_value = ConnectionStatus(connected=True, message="OK")
+        mock_details.side_effect = [TimeoutError("no reply"), None]
+
+        with patch("sys.stdin", StringIO("info 0\ninfo 1\n")), \
+                patch("sys.stderr", new_callable=StringIO):
+            main(["--persist"])
+
+        self.assertEqual(mock_test.call_count, 2)
+
+    @patch("core.get_track_details")
+    @patch("core.check_connection")
+    @patch("core.get_osc_client")
+    def test_failed_connection_check_is_not_cached(
+        self,
+        mock_client: MagicMock,
+        mock_test: MagicMock,
+        mock_details: MagicMock,
+    ) -> None:
+        """A disconnected status should be re-checked on the next command."""
+        mock_test.return_value = ConnectionStatus(connected=False, message="No")
+
+        with patch("sys.stdin", StringIO("info 0\ninfo 1\n")), \
+                patch("sys.stderr", new_callable=StringIO):
+            main(["--persist"])
+
+        self.assertEqual(mock_test.call_count, 2)
+        mock_details.assert_not_called()
+
+    def test_usage_errors_do_not_end_session(self) -> None:
+        """argparse errors should be reported without exiting the loop."""
+        with patch("sys.stdin", StringIO("info nope\nquit\nstatus\n")), \
+                patch("sys.stderr", new_callable=StringIO):
+            result = main(["--persist"])
+
+        self.assertEqual(result, 2)
+
+    @patch("core.get_osc_client")
+    def test_handler_errors_do_not_end_session(self, mock_client: MagicMock) -> None:
+        """An exception from one command should be reported, not end the loop."""
+        mock_client.side_effect = [OSError("Address already in use"), MagicMock()]
+
+        with patch("sys.stdin", StringIO("status\nquit\n")), \
+                patch("sys.stderr", new_callable=StringIO) as stderr:
+            result = main(["--persist"])
+
+        self.assertEqual(result, EXIT_ERROR)
+        self.assertIn("Address already in use", stderr.getvalue())
+
+    def test_persist_is_listed_in_help(self) -> None:
+        """--persist should be a documented option."""
+        self.assertIn("--persist", create_parser().format_help())
+
+    def test_persist_with_command_is_a_usage_error(self) -> None:
+        """Commands come from stdin in --persist mode, not argv."""
+        with patch("sys.stderr", new_callable=StringIO):
+            with self.assertRaises(SystemExit):
+                main(["--persist", "status"])
+
+
 class TestNoCommand(unittest.TestCase):
     """Test behavior with no command."""
 
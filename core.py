@@ -7,29 +7,42 @@ All functions are synchronous and return structured data.
 
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from itertools import islice
+from typing import Iterator, Optional, Union
 
 from osc_client import (
     AbletonOSCClient,
+    Clip,
+    try_get_track_count,
     get_track_count,
+    iter_track_rows,
+    bulk_track_data_supported,
+    get_all_track_names,
     get_track_name,
     get_track_muted,
     get_track_is_foldable,
     get_track_is_grouped,
     get_track_group_track_index,
     get_arrangement_clips,
+    get_track_audio_bounds,
     get_tempo,
+    get_beats_per_bar,
     select_track,
+    wait_for_selected_track,
     set_loop_range,
+    TRACK_BATCH_SIZE,
 )
 from gui_automation import (
     safe_export_with_filename,
     set_export_render_range,
     open_export_dialog,
     activate_ableton,
-    verify_in_dialog,
+    wait_for_dialog,
+    click_export_button,
     close_dialog_with_escape,
     INVALID_FILENAME_CHARS,
     EXPORT_DIALOG_PREFIX,
@@ -42,7 +55,7 @@ class TrackType(Enum):
     GROUP = "group"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TrackInfo:
     """Information about a track."""
     index: int
@@ -54,7 +67,7 @@ class TrackInfo:
     audio_end: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExportInfo:
     """Information for exporting a track."""
     track_name: str
@@ -64,7 +77,7 @@ class ExportInfo:
     suggested_filename: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConnectionStatus:
     """Connection status result."""
     connected: bool
@@ -73,7 +86,7 @@ class ConnectionStatus:
     message: str = ""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExportResult:
     """Result of an export operation."""
     success: bool
@@ -85,12 +98,80 @@ class ExportResult:
 BPM_MIN = 60
 BPM_MAX = 200
 
+# Concurrent arrangement clip queries in the audio range scan; below
+# PARALLEL_CLIP_MIN_TRACKS eligible tracks a thread pool isn't worth it
+CLIP_FETCH_WORKERS = 8
+PARALLEL_CLIP_MIN_TRACKS = 4
 
+DISCONNECTED_MESSAGE = "Could not connect. Make sure Ableton Live is running with AbletonOSC enabled."
+
+# BPM candidates: whole runs of digits, so "1999" is one out-of-range number
+# rather than a BPM of 199. A trailing "bpm" doesn't change what is
+# matched, so it isn't part of the pattern.
+_BPM_RE = re.compile(r'\d+')
+
+# Key: note letter + optional sharp/flat + optional min/maj/m. Suffixes are
+# longest-first so "minor" matches without first trying "min" and backing off
+_KEY_RE = re.compile(r'\b([A-G][#b]?)\s*(minor|major|min|maj|m)?\b', re.IGNORECASE)
+
+# Normalized suffix for each mode spelling _KEY_RE accepts
+_MODE_SUFFIXES = {"m": "min", "min": "min", "minor": "min", "maj": "maj", "major": "maj"}
+
+# Maps every invalid filename character to "_"
+_FILENAME_TRANS = str.maketrans({char: "_" for char in INVALID_FILENAME_CHARS})
+
+
+@lru_cache(maxsize=1)
 def get_osc_client() -> AbletonOSCClient:
-    """Create a new OSC client."""
+    """
+    Get the shared OSC client, creating it on first use.
+
+    The client binds AbletonOSC's reply port, so one process can only hold
+    one of them; reusing it also skips socket setup on every command.
+    """
     return AbletonOSCClient()
 
 
+@lru_cache(maxsize=512)
+def parse_bpm(name: str) -> Optional[int]:
+    """
+    Parse a BPM from a track/group name.
+
+    Args:
+        name: Track or group name to parse
+
+    Returns:
+        The first number within BPM_MIN..BPM_MAX, or None if not found
+    """
+    for bpm_match in _BPM_RE.finditer(name):
+        bpm_val = int(bpm_match.group())
+        if BPM_MIN <= bpm_val <= BPM_MAX:
+            return bpm_val
+    return None
+
+
+@lru_cache(maxsize=512)
+def parse_key(name: str) -> Optional[str]:
+    """
+    Parse a musical key from a track/group name.
+
+    Args:
+        name: Track or group name to parse
+
+    Returns:
+        Normalized key such as "Amin", "Cmaj" or "F#", or None if not found
+    """
+    key_match = _KEY_RE.search(name)
+    if not key_match:
+        return None
+
+    note = key_match.group(1).upper()
+    mode = key_match.group(2)
+    if mode:
+        return note + _MODE_SUFFIXES[mode.lower()]
+    return note
+
+
 def parse_key_and_bpm(name: str) -> tuple[Optional[str], Optional[int]]:
     """
     Parse musical key and BPM from a track/group name.
@@ -106,33 +187,10 @@ def parse_key_and_bpm(name: str) -> tuple[Optional[str], Optional[int]]:
     Returns:
         Tuple of (key, bpm) where either may be None if not found
     """
-    key = None
-    bpm = None
-
-    # Pattern for BPM: number followed by optional "bpm"
-    bpm_match = re.search(r'(\d{2,3})\s*(?:bpm)?', name, re.IGNORECASE)
-    if bpm_match:
-        bpm_val = int(bpm_match.group(1))
-        if BPM_MIN <= bpm_val <= BPM_MAX:
-            bpm = bpm_val
-
-    # Pattern for key: note letter + optional sharp/flat + optional min/maj/m
-    key_match = re.search(r'\b([A-G][#b]?)\s*(min|maj|minor|major|m)?\b', name, re.IGNORECASE)
-    if key_match:
-        note = key_match.group(1).upper()
-        mode = key_match.group(2)
-        if mode:
-            mode = mode.lower()
-            if mode in ('min', 'minor', 'm'):
-                key = f"{note}min"
-            elif mode in ('maj', 'major'):
-                key = f"{note}maj"
-            else:
-                key = note
-        else:
-            key = note
-
-    return key, bpm
+    # Unnamed tracks (e.g. returns) have nothing to parse
+    if not name or name.isspace():
+        return None, None
+    return parse_key(name), parse_bpm(name)
 
 
 def sanitize_filename(name: str) -> str:
@@ -145,10 +203,7 @@ def sanitize_filename(name: str) -> str:
     Returns:
         Sanitized string safe for use as filename
     """
-    result = name
-    for char in INVALID_FILENAME_CHARS:
-        result = result.replace(char, "_")
-    return result.strip()
+    return name.translate(_FILENAME_TRANS).strip()
 
 
 def check_connection(client: AbletonOSCClient) -> ConnectionStatus:
@@ -161,23 +216,26 @@ def check_connection(client: AbletonOSCClient) -> ConnectionStatus:
     Returns:
         ConnectionStatus with connection details
     """
-    if client.test_connection():
-        tempo = get_tempo(client)
-        count = get_track_count(client)
-        return ConnectionStatus(
-            connected=True,
-            tempo=tempo,
-            track_count=count,
-            message=f"Connected to Ableton Live! Tempo: {tempo} BPM, Tracks: {count}"
-        )
-    else:
-        return ConnectionStatus(
-            connected=False,
-            message="Could not connect. Make sure Ableton Live is running with AbletonOSC enabled."
-        )
+    # The three queries are independent, so wait for one round-trip, not three
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        connected = pool.submit(client.test_connection)
+        tempo_future = pool.submit(get_tempo, client)
+        count_future = pool.submit(get_track_count, client)
+
+        if not connected.result():
+            return ConnectionStatus(connected=False, message=DISCONNECTED_MESSAGE)
+        tempo = tempo_future.result()
+        count = count_future.result()
+
+    return ConnectionStatus(
+        connected=True,
+        tempo=tempo,
+        track_count=count,
+        message=f"Connected to Ableton Live! Tempo: {tempo} BPM, Tracks: {count}"
+    )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AudioRange:
     """Range of audio content in the arrangement."""
     start_beats: float
@@ -188,58 +246,60 @@ class AudioRange:
     length_bars: int
 
 
-def get_arrangement_audio_range(client: AbletonOSCClient) -> Optional[AudioRange]:
+def _clip_bounds(clips: list[Clip]) -> Optional[tuple[float, float]]:
     """
-    Detect the actual audio range across ALL tracks in the arrangement.
+    Get (start, end) in beats spanned by already-fetched arrangement clips.
 
-    Scans all non-muted tracks to find the earliest clip start and latest clip end.
-    This gives the exact range of actual audio content, avoiding silence.
+    Matches get_track_audio_bounds, which computes the same span without
+    fetching the clips.
+    """
+    if not clips:
+        return None
+    return clips[0].start_time, clips[-1].start_time + clips[-1].length
+
+
+def _audio_range_for_tracks(
+    client: AbletonOSCClient,
+    track_indices: list[int],
+    tempo: Optional[float] = None,
+) -> Optional[AudioRange]:
+    """
+    Compute the audio range spanned by the given tracks' arrangement clips.
 
     Args:
         client: OSC client to use
+        track_indices: Tracks to include (callers exclude muted and group tracks)
+        tempo: Current Live tempo, if already known
 
     Returns:
         AudioRange with the detected range, or None if no clips found
     """
-    count = get_track_count(client)
-    if count == 0:
-        return None
-
-    earliest_start = float('inf')
-    latest_end = 0.0
-    has_clips = False
-
-    for track_idx in range(count):
-        # Skip muted tracks
-        if get_track_muted(client, track_idx):
-            continue
-
-        # Skip group tracks (they don't have their own clips)
-        if get_track_is_foldable(client, track_idx):
-            continue
-
-        clips = get_arrangement_clips(client, track_idx)
-        if clips:
-            has_clips = True
-            # First clip has earliest start for this track
-            track_start = clips[0].start_time
-            # Last clip end = start + length
-            track_end = clips[-1].start_time + clips[-1].length
-
-            earliest_start = min(earliest_start, track_start)
-            latest_end = max(latest_end, track_end)
+    # Clip queries are independent per track, so overlap their round-trips
+    if len(track_indices) < PARALLEL_CLIP_MIN_TRACKS:
+        all_bounds = [get_track_audio_bounds(client, i) for i in track_indices]
+    else:
+        with ThreadPoolExecutor(max_workers=CLIP_FETCH_WORKERS) as pool:
+            all_bounds = list(pool.map(lambda i: get_track_audio_bounds(client, i), track_indices))
 
-    if not has_clips:
+    spans = [bounds for bounds in all_bounds if bounds]
+    if not spans:
         return None
 
+    earliest_start = min(start for start, _ in spans)
+    latest_end = max(end for _, end in spans)
     length_beats = latest_end - earliest_start
-    tempo = get_tempo(client)
+    if tempo is None:
+        tempo = get_tempo(client)
     duration_seconds = (length_beats / tempo) * 60
 
-    # Calculate bar numbers (assuming 4 beats per bar)
-    beats_per_bar = 4
-    start_bar = int(earliest_start / beats_per_bar) + 1  # Bars are 1-indexed in Ableton
-    length_bars = int((length_beats + beats_per_bar - 1) / beats_per_bar)  # Round up
+    # The render range is whole bars of the song's time signature, so span
+    # from the bar holding the first clip start to the bar holding the last
+    # clip end
+    beats_per_bar = get_beats_per_bar(client)
+    first_bar = int(earliest_start // beats_per_bar)
+    end_bar = int(-(-latest_end // beats_per_bar))  # Round up
+    start_bar = first_bar + 1  # Bars are 1-indexed in Ableton
+    length_bars = end_bar - first_bar
 
     return AudioRange(
         start_beats=earliest_start,
@@ -251,120 +311,318 @@ def get_arrangement_audio_range(client: AbletonOSCClient) -> Optional[AudioRange
     )
 
 
-def get_all_tracks(client: AbletonOSCClient, include_clips: bool = False) -> list[TrackInfo]:
+def get_arrangement_audio_range(
+    client: AbletonOSCClient,
+    tempo: Optional[float] = None,
+    track_count: Optional[int] = None,
+) -> Optional[AudioRange]:
+    """
+    Detect the actual audio range across ALL tracks in the arrangement.
+
+    Scans all non-muted tracks to find the earliest clip start and latest clip end.
+    This gives the exact range of actual audio content, avoiding silence.
+
+    Args:
+        client: OSC client to use
+        tempo: Current Live tempo, if already known (skips the tempo query)
+        track_count: Number of tracks, if already known (skips the count query)
+
+    Returns:
+        AudioRange with the detected range, or None if no clips found
+    """
+    count = track_count if track_count is not None else get_track_count(client)
+    if count == 0:
+        return None
+
+    # Skip muted tracks, and group tracks (they don't have their own clips)
+    rows = iter_track_rows(client, 0, count, ("mute", "is_foldable"))
+    eligible = [i for i, (muted, is_group) in rows if not muted and not is_group]
+    return _audio_range_for_tracks(client, eligible, tempo)
+
+
+def scan_arrangement(
+    client: AbletonOSCClient,
+    include_range: bool = True,
+    tempo: Optional[float] = None,
+    track_count: Optional[int] = None,
+) -> tuple[Optional[AudioRange], Optional[str]]:
+    """
+    Detect the audio range and the set's key in a single pass over the tracks.
+
+    The key is taken from the first group track whose name contains one.
+
+    Args:
+        client: OSC client to use
+        include_range: Whether to detect the audio range (skips clip queries if False)
+        tempo: Current Live tempo, if already known (skips the tempo query)
+        track_count: Number of tracks, if already known (skips the count query)
+
+    Returns:
+        Tuple of (audio_range, key); either may be None if not found
+    """
+    count = track_count if track_count is not None else get_track_count(client)
+    key = None
+    eligible = []
+
+    if not include_range:
+        # Only the key is wanted, so stop at the first group that has one
+        for _, (name, is_group) in iter_track_rows(
+            client, 0, count, ("name", "is_foldable")
+        ):
+            if is_group:
+                key = parse_key(name)
+                if key is not None:
+                    break
+        return None, key
+
+    for i, (name, muted, is_group) in iter_track_rows(
+        client, 0, count, ("name", "mute", "is_foldable")
+    ):
+        if is_group:
+            if key is None:
+                key = parse_key(name)
+        elif not muted:
+            eligible.append(i)
+
+    audio_range = None
+    if eligible:
+        audio_range = _audio_range_for_tracks(client, eligible, tempo)
+    return audio_range, key
+
+
+def iter_all_tracks(
+    client: AbletonOSCClient,
+    include_clips: bool = False,
+    track_count: Optional[int] = None,
+) -> Iterator[TrackInfo]:
+    """
+    Yield information about each track as soon as it has been queried.
+
+    Args:
+        client: OSC client to use
+        include_clips: Whether to include clip count for each track
+        track_count: Number of tracks, if already known (skips the count query)
+
+    Yields:
+        TrackInfo objects in track order
+    """
+    count = track_count if track_count is not None else get_track_count(client)
+
+    # Bound once, outside the per-track loop
+    group, track = TrackType.GROUP, TrackType.TRACK
+
+    rows = iter_track_rows(client, 0, count, ("name", "is_foldable", "mute"))
+    if not include_clips:
+        for i, (name, is_group, muted) in rows:
+            yield TrackInfo(
+                index=i,
+                name=name,
+                track_type=group if is_group else track,
+                muted=bool(muted),
+            )
+        return
+
+    def clip_count(row: tuple[int, tuple]) -> int:
+        i, (_, is_group, _) = row
+        if is_group:
+            return 0
+        clips = get_arrangement_clips(client, i)
+        return len(clips) if clips else 0
+
+    # Clip queries are independent per track, so overlap them a batch at a time
+    with ThreadPoolExecutor(max_workers=CLIP_FETCH_WORKERS) as pool:
+        while batch := list(islice(rows, TRACK_BATCH_SIZE)):
+            for (i, (name, is_group, muted)), clips in zip(batch, pool.map(clip_count, batch)):
+                yield TrackInfo(
+                    index=i,
+                    name=name,
+                    track_type=group if is_group else track,
+                    muted=bool(muted),
+                    clip_count=clips,
+                )
+
+
+def get_all_tracks(
+    client: AbletonOSCClient,
+    include_clips: bool = False,
+    track_count: Optional[int] = None,
+) -> list[TrackInfo]:
     """
     Get information about all tracks.
 
     Args:
         client: OSC client to use
         include_clips: Whether to include clip count for each track
+        track_count: Number of tracks, if already known (skips the count query)
 
     Returns:
         List of TrackInfo objects
     """
-    count = get_track_count(client)
-    tracks = []
+    return list(iter_all_tracks(client, include_clips=include_clips, track_count=track_count))
 
-    for i in range(count):
-        name = get_track_name(client, i)
-        is_group = get_track_is_foldable(client, i)
-        muted = get_track_muted(client, i)
 
-        clip_count = 0
-        if include_clips and not is_group:
-            clips = get_arrangement_clips(client, i)
-            clip_count = len(clips) if clips else 0
+def get_all_tracks_or_error(
+    client: AbletonOSCClient,
+    include_clips: bool = False,
+) -> Union[list[TrackInfo], ConnectionStatus]:
+    """
+    Get all tracks, using the track count query as the connection check.
 
-        tracks.append(TrackInfo(
-            index=i,
-            name=name,
-            track_type=TrackType.GROUP if is_group else TrackType.TRACK,
-            muted=muted,
-            clip_count=clip_count,
-        ))
+    This replaces a separate check_connection() call (three round-trips)
+    for callers that only need track data.
 
-    return tracks
+    Args:
+        client: OSC client to use
+        include_clips: Whether to include clip count for each track
+
+    Returns:
+        List of TrackInfo objects, or a disconnected ConnectionStatus if
+        AbletonOSC did not respond
+    """
+    count = try_get_track_count(client)
+    if count is None:
+        return ConnectionStatus(connected=False, message=DISCONNECTED_MESSAGE)
+    return get_all_tracks(client, include_clips=include_clips, track_count=count)
 
 
-def get_groups(client: AbletonOSCClient) -> list[TrackInfo]:
+def get_groups(
+    client: AbletonOSCClient,
+    tracks: Optional[list[TrackInfo]] = None,
+) -> list[TrackInfo]:
     """
     Get all group tracks.
 
     Args:
         client: OSC client to use
+        tracks: Already-fetched tracks to filter instead of querying Live
 
     Returns:
         List of TrackInfo for groups only
     """
-    all_tracks = get_all_tracks(client)
-    return [t for t in all_tracks if t.track_type == TrackType.GROUP]
+    all_tracks = tracks if tracks is not None else get_all_tracks(client)
+    group = TrackType.GROUP
+    return [t for t in all_tracks if t.track_type is group]
 
 
-def get_track_details(client: AbletonOSCClient, track_index: int) -> Optional[TrackInfo]:
+def get_track_details(
+    client: AbletonOSCClient,
+    track_index: int,
+    track_count: Optional[int] = None,
+) -> Optional[TrackInfo]:
     """
     Get detailed information about a specific track.
 
     Args:
         client: OSC client to use
         track_index: Index of the track
+        track_count: Number of tracks, if already known (skips the count query)
 
     Returns:
         TrackInfo with full details, or None if invalid index
     """
-    count = get_track_count(client)
+    count = track_count if track_count is not None else get_track_count(client)
     if track_index < 0 or track_index >= count:
         return None
 
-    name = get_track_name(client, track_index)
-    is_group = get_track_is_foldable(client, track_index)
-    muted = get_track_muted(client, track_index)
+    _, (name, is_group, muted) = next(iter_track_rows(
+        client, track_index, track_index + 1, ("name", "is_foldable", "mute")
+    ))
     clips = get_arrangement_clips(client, track_index)
-
-    audio_start = None
-    audio_end = None
-    if clips:
-        audio_start = clips[0].start_time
-        audio_end = clips[-1].start_time + clips[-1].length
+    audio_start, audio_end = _clip_bounds(clips) or (None, None)
 
     return TrackInfo(
         index=track_index,
         name=name,
         track_type=TrackType.GROUP if is_group else TrackType.TRACK,
-        muted=muted,
+        muted=bool(muted),
         clip_count=len(clips) if clips else 0,
         audio_start=audio_start,
         audio_end=audio_end,
     )
 
 
-def find_tracks_by_name(client: AbletonOSCClient, search: str) -> list[TrackInfo]:
+def find_tracks_by_name(
+    client: AbletonOSCClient,
+    search: str,
+    tracks: Optional[list[TrackInfo]] = None,
+    track_count: Optional[int] = None,
+) -> list[TrackInfo]:
     """
     Find tracks by name (partial match, case-insensitive).
 
+    Without pre-fetched tracks, only the names are queried up front; group
+    and mute state are then read in bulk for runs of matching tracks.
+
     Args:
         client: OSC client to use
         search: Text to search for
+        tracks: Already-fetched tracks to search instead of querying Live
+        track_count: Number of tracks, if already known
 
     Returns:
         List of matching TrackInfo objects
     """
-    all_tracks = get_all_tracks(client)
     search_lower = search.lower()
-    return [t for t in all_tracks if search_lower in t.name.lower()]
-
-
-def select_track_by_index(client: AbletonOSCClient, track_index: int) -> tuple[bool, str]:
+    if tracks is not None:
+        return [t for t in tracks if search_lower in t.name.lower()]
+
+    names = get_all_track_names(client, track_count=track_count)
+    hits = [i for i, name in enumerate(names) if search_lower in name.lower()]
+
+    if not hits:
+        return []
+
+    # One bulk read per run of adjacent hits; when hits are scattered enough
+    # that the runs outnumber the batches covering them all, read the span
+    runs = _index_runs(hits)
+    span_batches = -(-(hits[-1] + 1 - hits[0]) // TRACK_BATCH_SIZE)
+    if len(runs) > span_batches and bulk_track_data_supported(client):
+        runs = [(hits[0], hits[-1] + 1)]
+
+    hit_set = set(hits)
+    matches = []
+    for start, end in runs:
+        for i, (is_group, muted) in iter_track_rows(client, start, end, ("is_foldable", "mute")):
+            if i in hit_set:
+                matches.append(TrackInfo(
+                    index=i,
+                    name=names[i],
+                    track_type=TrackType.GROUP if is_group else TrackType.TRACK,
+                    muted=bool(muted),
+                ))
+    return matches
+
+
+def _index_runs(indices: list[int]) -> list[tuple[int, int]]:
+    """Group sorted indices into (start, end) runs of consecutive values."""
+    runs = []
+    start = prev = indices[0]
+    for i in indices[1:]:
+        if i != prev + 1:
+            runs.append((start, prev + 1))
+            start = i
+        prev = i
+    runs.append((start, prev + 1))
+    return runs
+
+
+def select_track_by_index(
+    client: AbletonOSCClient,
+    track_index: int,
+    track_count: Optional[int] = None,
+) -> tuple[bool, str]:
     """
     Select a track by index.
 
     Args:
         client: OSC client to use
         track_index: Index of the track to select
+        track_count: Number of tracks, if already known (skips the count query)
 
     Returns:
         Tuple of (success, message)
     """
-    count = get_track_count(client)
+    count = track_count if track_count is not None else get_track_count(client)
     if track_index < 0 or track_index >= count:
         return False, f"Invalid track index. Valid range: 0-{count-1}"
 
@@ -373,7 +631,12 @@ def select_track_by_index(client: AbletonOSCClient, track_index: int) -> tuple[b
     return True, f"Selected track {track_index}: {name}"
 
 
-def set_export_range(client: AbletonOSCClient, start_beats: float, length_beats: float) -> str:
+def set_export_range(
+    client: AbletonOSCClient,
+    start_beats: float,
+    length_beats: float,
+    tempo: Optional[float] = None,
+) -> str:
     """
     Set the loop/punch range for export.
 
@@ -381,11 +644,13 @@ def set_export_range(client: AbletonOSCClient, start_beats: float, length_beats:
         client: OSC client to use
         start_beats: Start position in beats
         length_beats: Length in beats
+        tempo: Current tempo, if already known (skips the tempo query)
 
     Returns:
         Confirmation message with time info
     """
-    tempo = get_tempo(client)
+    if tempo is None:
+        tempo = get_tempo(client)
     set_loop_range(client, start_beats, length_beats)
 
     duration_sec = (length_beats / tempo) * 60
@@ -397,51 +662,48 @@ def set_export_range(client: AbletonOSCClient, start_beats: float, length_beats:
     )
 
 
-def get_track_export_info(client: AbletonOSCClient, track_index: int) -> Optional[ExportInfo]:
+def build_export_info(
+    track_name: str,
+    group_name: Optional[str],
+    tempo: Optional[float] = None,
+) -> ExportInfo:
     """
-    Get all info needed for exporting a track with proper naming.
+    Work out key, BPM and a suggested filename from already-fetched names.
+
+    Key and BPM are parsed from the group name first, then the track name.
+    If neither contains a BPM, the Live tempo is used.
 
     Args:
-        client: OSC client to use
-        track_index: Index of the track
+        track_name: Name of the track being exported
+        group_name: Name of its group track, if it is in one
+        tempo: Current Live tempo, used only when no BPM is found in the names
 
     Returns:
-        ExportInfo with suggested filename, or None if invalid index
+        ExportInfo with suggested filename
     """
-    count = get_track_count(client)
-    if track_index < 0 or track_index >= count:
-        return None
-
-    track_name = get_track_name(client, track_index)
-    group_name = None
     key = None
     bpm = None
 
-    # Check if track is in a group
-    if get_track_is_grouped(client, track_index):
-        group_idx = get_track_group_track_index(client, track_index)
-        if group_idx is not None:
-            group_name = get_track_name(client, group_idx)
-            key, bpm = parse_key_and_bpm(group_name)
-
-    # If no key/BPM from group, try from track name
-    if not key or not bpm:
-        track_key, track_bpm = parse_key_and_bpm(track_name)
-        key = key or track_key
-        bpm = bpm or track_bpm
+    if group_name is not None:
+        key, bpm = parse_key_and_bpm(group_name)
 
-    # If still no BPM, get from Live
+    # Fill in whatever the group name didn't provide from the track name,
+    # scanning only for the missing value
+    if not key:
+        key = parse_key(track_name)
     if not bpm:
-        bpm = int(get_tempo(client))
+        bpm = parse_bpm(track_name)
 
-    # Generate suggested filename
-    parts = [sanitize_filename(track_name)]
+    # If still no BPM, use the tempo from Live
+    if not bpm and tempo is not None:
+        bpm = int(tempo)
+
+    # Generate suggested filename: track[_key][_NNNbpm]
+    suggested_filename = sanitize_filename(track_name)
     if key:
-        parts.append(key)
+        suggested_filename = f"{suggested_filename}_{key}"
     if bpm:
-        parts.append(f"{bpm}bpm")
-
-    suggested_filename = "_".join(parts)
+        suggested_filename = f"{suggested_filename}_{bpm}bpm"
 
     return ExportInfo(
         track_name=track_name,
@@ -452,37 +714,82 @@ def get_track_export_info(client: AbletonOSCClient, track_index: int) -> Optiona
     )
 
 
-def prepare_track_for_export(client: AbletonOSCClient, track_index: int) -> tuple[bool, str]:
+def _fetch_export_info(
+    client: AbletonOSCClient,
+    track_index: int,
+    track_name: str,
+    tempo: Optional[float] = None,
+) -> ExportInfo:
+    """Query the group name (and tempo, if needed) for a track whose name is known."""
+    group_name = None
+    if get_track_is_grouped(client, track_index):
+        group_idx = get_track_group_track_index(client, track_index)
+        if group_idx is not None:
+            group_name = get_track_name(client, group_idx)
+
+    info = build_export_info(track_name, group_name, tempo)
+    if info.bpm is None and tempo is None:
+        # Only ask Live for the tempo when the names didn't provide a BPM
+        info = build_export_info(track_name, group_name, get_tempo(client))
+    return info
+
+
+def get_track_export_info(client: AbletonOSCClient, track_index: int) -> Optional[ExportInfo]:
+    """
+    Get all info needed for exporting a track with proper naming.
+
+    Args:
+        client: OSC client to use
+        track_index: Index of the track
+
+    Returns:
+        ExportInfo with suggested filename, or None if invalid index
+    """
+    count = get_track_count(client)
+    if track_index < 0 or track_index >= count:
+        return None
+
+    return _fetch_export_info(client, track_index, get_track_name(client, track_index))
+
+
+def prepare_track_for_export(
+    client: AbletonOSCClient,
+    track_index: int,
+    tempo: Optional[float] = None,
+    track_count: Optional[int] = None,
+) -> tuple[bool, str]:
     """
     Prepare a track for export by selecting it and setting the loop range.
 
     Args:
         client: OSC client to use
         track_index: Index of the track to prepare
+        tempo: Current tempo, if already known (skips the tempo query)
+        track_count: Number of tracks, if already known (skips the count query)
 
     Returns:
         Tuple of (success, message)
     """
-    count = get_track_count(client)
+    count = track_count if track_count is not None else get_track_count(client)
     if track_index < 0 or track_index >= count:
         return False, f"Invalid track index. Valid range: 0-{count-1}"
 
     name = get_track_name(client, track_index)
-    clips = get_arrangement_clips(client, track_index)
+    bounds = get_track_audio_bounds(client, track_index)
 
-    if not clips:
+    if not bounds:
         return False, f"Track '{name}' has no arrangement clips to export"
 
     # Calculate range from clips
-    start = clips[0].start_time
-    end = clips[-1].start_time + clips[-1].length
+    start, end = bounds
     length = end - start
 
     # Set range and select track
     set_loop_range(client, start, length)
     select_track(client, track_index)
 
-    tempo = get_tempo(client)
+    if tempo is None:
+        tempo = get_tempo(client)
     duration_sec = (length / tempo) * 60
 
     return True, f"Prepared '{name}' for export: {start:.1f} - {end:.1f} beats ({duration_sec:.1f} seconds)"
@@ -493,6 +800,8 @@ def export_track(
     track_index: Optional[int] = None,
     output_folder: Optional[str] = None,
     custom_filename: Optional[str] = None,
+    tempo: Optional[float] = None,
+    track_count: Optional[int] = None,
 ) -> ExportResult:
     """
     Export a track with full safety checks.
@@ -502,6 +811,8 @@ def export_track(
         track_index: Track to export (uses current selection if None)
         output_folder: Folder to save to (uses Ableton default if None)
         custom_filename: Override the auto-generated filename
+        tempo: Current tempo, if already known (skips the tempo query)
+        track_count: Number of tracks, if already known (skips the count query)
 
     Returns:
         ExportResult with success status and details
@@ -509,39 +820,41 @@ def export_track(
     filename = custom_filename
     track_name = "unknown"
 
-    # If track_index provided, set up the track
-    if track_index is not None:
-        count = get_track_count(client)
-        if track_index < 0 or track_index >= count:
-            return ExportResult(
-                success=False,
-                filename="",
-                message=f"Invalid track index. Valid range: 0-{count-1}"
-            )
-
-        track_name = get_track_name(client, track_index)
-
-        # Get clips to set loop range
-        clips = get_arrangement_clips(client, track_index)
-        if clips:
-            start = clips[0].start_time
-            end = clips[-1].start_time + clips[-1].length
-            length = end - start
-            set_loop_range(client, start, length)
-
-        # Get export info for smart filename
-        export_info = get_track_export_info(client, track_index)
-        if export_info and not filename:
-            filename = export_info.suggested_filename
-
-        # Select the track
-        select_track(client, track_index)
-        time.sleep(0.3)
-    else:
-        # No track specified
-        if not filename:
-            tempo = int(get_tempo(client))
-            filename = f"export_{tempo}bpm_{int(time.time())}"
+    # One session so the count and tempo are asked for at most once
+    with client.session():
+        # If track_index provided, set up the track
+        if track_index is not None:
+            count = track_count if track_count is not None else get_track_count(client)
+            if track_index < 0 or track_index >= count:
+                return ExportResult(
+                    success=False,
+                    filename="",
+                    message=f"Invalid track index. Valid range: 0-{count-1}"
+                )
+
+            track_name = get_track_name(client, track_index)
+
+            # Set the loop range to span the track's clips
+            bounds = get_track_audio_bounds(client, track_index)
+            if bounds:
+                start, end = bounds
+                set_loop_range(client, start, end - start)
+
+            # Get export info for smart filename, reusing the name fetched above
+            if not filename:
+                filename = _fetch_export_info(
+                    client, track_index, track_name, tempo
+                ).suggested_filename
+
+            # Select the track
+            select_track(client, track_index)
+            wait_for_selected_track(client, track_index, timeout=0.3)
+        else:
+            # No track specified
+            if not filename:
+                if tempo is None:
+                    tempo = get_tempo(client)
+                filename = f"export_{int(tempo)}bpm_{int(time.time())}"
 
     # Perform the safe export with verification at each step
     success, message = safe_export_with_filename(filename, output_folder)
@@ -565,6 +878,9 @@ def export_arrangement(
     output_folder: Optional[str] = None,
     custom_filename: Optional[str] = None,
     auto_detect_range: bool = True,
+    audio_range: Optional[AudioRange] = None,
+    tempo: Optional[float] = None,
+    track_count: Optional[int] = None,
 ) -> ExportResult:
     """
     Export the full arrangement mix with automatic audio range detection.
@@ -577,43 +893,47 @@ def export_arrangement(
         output_folder: Folder to save to (uses Ableton default if None)
         custom_filename: Override the auto-generated filename
         auto_detect_range: If True, automatically detect audio range (default: True)
+        audio_range: Range already detected by the caller (skips detection)
+        tempo: Current Live tempo, if already known (skips the tempo query)
+        track_count: Number of tracks, if already known (skips the count query)
 
     Returns:
         ExportResult with success status and details
     """
-    # Detect audio range if requested
-    audio_range = None
-    if auto_detect_range:
-        audio_range = get_arrangement_audio_range(client)
-        if not audio_range:
+    # One session so the count and tempo are asked for at most once
+    with client.session():
+        # Range detection and the filename's key come from one pass over the tracks
+        key = None
+        if not auto_detect_range:
+            audio_range = None
+        needs_range = auto_detect_range and audio_range is None
+        if needs_range or not custom_filename:
+            scanned_range, key = scan_arrangement(
+                client, include_range=needs_range, tempo=tempo, track_count=track_count
+            )
+            if needs_range:
+                audio_range = scanned_range
+
+        if auto_detect_range and not audio_range:
             return ExportResult(
                 success=False,
                 filename="",
                 message="No audio clips found in arrangement"
             )
 
-    # Generate filename
-    if custom_filename:
-        filename = custom_filename
-    else:
-        tempo = int(get_tempo(client))
-        # Try to get key from group names
-        key = None
-        tracks = get_all_tracks(client)
-        for track in tracks:
-            if track.track_type == TrackType.GROUP:
-                track_key, _ = parse_key_and_bpm(track.name)
-                if track_key:
-                    key = track_key
-                    break
-
-        parts = ["arrangement"]
-        if key:
-            parts.append(key)
-        parts.append(f"{tempo}bpm")
-        if audio_range:
-            parts.append(f"{audio_range.length_bars}bars")
-        filename = "_".join(parts)
+        # Generate filename
+        if custom_filename:
+            filename = custom_filename
+        else:
+            if tempo is None:
+                tempo = get_tempo(client)
+            parts = ["arrangement"]
+            if key:
+                parts.append(key)
+            parts.append(f"{int(tempo)}bpm")
+            if audio_range:
+                parts.append(f"{audio_range.length_bars}bars")
+            filename = "_".join(parts)
 
     # Activate Ableton
     if not activate_ableton():
@@ -622,20 +942,18 @@ def export_arrangement(
             filename=filename,
             message="Could not activate Ableton Live"
         )
-    time.sleep(0.5)
 
-    # Open export dialog
-    if not open_export_dialog():
+    # Open export dialog; Live was just brought to the front
+    if not open_export_dialog(activate=False):
         return ExportResult(
             success=False,
             filename=filename,
             message="Could not open export dialog"
         )
-    time.sleep(1.5)
 
-    # Verify we're in the Export dialog
-    is_safe, window_name = verify_in_dialog()
-    if EXPORT_DIALOG_PREFIX not in window_name:
+    # Wait for the Export dialog rather than sleeping a fixed worst case
+    found, window_name = wait_for_dialog(EXPORT_DIALOG_PREFIX)
+    if not found:
         close_dialog_with_escape()
         return ExportResult(
             success=False,
@@ -645,7 +963,9 @@ def export_arrangement(
 
     # Set render range based on detected audio
     if audio_range:
-        success, range_msg = set_export_render_range(audio_range.start_bar, audio_range.length_bars)
+        success, range_msg = set_export_render_range(
+            audio_range.start_bar, audio_range.length_bars, verified_window=window_name
+        )
         if not success:
             close_dialog_with_escape()
             return ExportResult(
@@ -654,23 +974,8 @@ def export_arrangement(
                 message=f"Could not set render range: {range_msg}"
             )
 
-    # Click the Export button (button 10) directly since dialog is already open
-    # Note: Button 1-9 are checkboxes, Button 10 = Export, Button 11 = Cancel
-    from gui_automation import run_applescript, _handle_export_confirmation_and_wait
-
-    script = '''
-    tell application "System Events"
-        tell process "Live"
-            tell front window
-                tell group 1
-                    click button 10
-                end tell
-            end tell
-        end tell
-    end tell
-    '''
-    success, _ = run_applescript(script)
-    if not success:
+    # Click the Export button directly since dialog is already open
+    if not click_export_button():
         close_dialog_with_escape()
         return ExportResult(
             success=False,
@@ -681,6 +986,8 @@ def export_arrangement(
     time.sleep(1.0)
 
     # Handle confirmation and wait for completion
+    from gui_automation import _handle_export_confirmation_and_wait
+
     try:
         _handle_export_confirmation_and_wait()
         success = True
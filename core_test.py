@@ -4,8 +4,18 @@ Tests for core module.
 Tests the core business logic functions without requiring Ableton Live.
 """
 
+import threading
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import DEFAULT, MagicMock, patch
+
+from osc_client import (
+    TRACK_DATA_ADDRESS,
+    AbletonOSCClient,
+    Clip,
+    _PendingQuery,
+    bulk_track_data_supported,
+    get_beats_per_bar,
+)
 
 from core import (
     # Constants
@@ -20,12 +30,17 @@ from core import (
     # Functions
     parse_key_and_bpm,
     sanitize_filename,
+    build_export_info,
     check_connection,
     get_all_tracks,
+    get_all_tracks_or_error,
     get_groups,
     get_track_details,
     find_tracks_by_name,
     select_track_by_index,
+    set_export_range,
+    get_arrangement_audio_range,
+    scan_arrangement,
 )
 
 
@@ -152,6 +167,18 @@ class TestParseKeyAndBpm(unittest.TestCase):
         _, bpm = parse_key_and_bpm("fast 250bpm")
         self.assertIsNone(bpm)
 
+    def test_skips_out_of_range_numbers(self) -> None:
+        """Should keep looking past numbers outside the BPM range."""
+        _, bpm = parse_key_and_bpm("Take 01 - 140bpm")
+        self.assertEqual(bpm, 140)
+
+    def test_ignores_digits_inside_longer_numbers(self) -> None:
+        """Should not read a BPM out of a year or other long number."""
+        _, bpm = parse_key_and_bpm("Mix 1999 - 140bpm")
+        self.assertEqual(bpm, 140)
+        _, bpm = parse_key_and_bpm("Set01 2024")
+        self.assertIsNone(bpm)
+
     def test_accepts_bpm_at_boundaries(self) -> None:
         """Should accept BPM at boundary values."""
         _, bpm60 = parse_key_and_bpm(f"slow {BPM_MIN}bpm")
@@ -175,6 +202,10 @@ class TestParseKeyAndBpm(unittest.TestCase):
         self.assertIsNone(key)
         self.assertIsNone(bpm)
 
+    def test_returns_none_for_whitespace(self) -> None:
+        """Should return (None, None) for a name that is only whitespace."""
+        self.assertEqual(parse_key_and_bpm("   \t"), (None, None))
+
     def test_case_insensitive(self) -> None:
         """Should parse keys case-insensitively."""
         key, bpm = parse_key_and_bpm("AMIN - 143BPM")
@@ -251,6 +282,29 @@ class TestSanitizeFilename(unittest.TestCase):
         self.assertEqual(result, "")
 
 
+class TestBuildExportInfo(unittest.TestCase):
+    """Test export filename generation from track and group names."""
+
+    def test_group_name_takes_precedence(self) -> None:
+        """Key and BPM should come from the group name when present."""
+        info = build_export_info("flute", "Amin - 143bpm")
+        self.assertEqual(info.key, "Amin")
+        self.assertEqual(info.bpm, 143)
+        self.assertEqual(info.suggested_filename, "flute_Amin_143bpm")
+
+    def test_falls_back_to_track_name(self) -> None:
+        """Missing values should be filled in from the track name."""
+        info = build_export_info("Bass Fmin 128", None)
+        self.assertEqual(info.key, "Fmin")
+        self.assertEqual(info.bpm, 128)
+
+    def test_tempo_used_when_names_have_no_bpm(self) -> None:
+        """The Live tempo should only fill in a missing BPM."""
+        self.assertIsNone(build_export_info("Lead", None).bpm)
+        self.assertEqual(build_export_info("Lead", None, 121.7).bpm, 121)
+        self.assertEqual(build_export_info("Lead 140bpm", None, 90.0).bpm, 140)
+
+
 class TestConnectionFunctions(unittest.TestCase):
     """Test connection-related functions."""
 
@@ -282,29 +336,53 @@ class TestConnectionFunctions(unittest.TestCase):
         self.assertIn("Could not connect", status.message)
 
 
+# Per-track getters iter_track_rows falls back to without the bulk query
+ROW_GETTERS = ("get_track_name", "get_track_is_foldable", "get_track_muted")
+
+
 class TestTrackFunctions(unittest.TestCase):
     """Test track-related functions."""
 
-    @patch("core.get_arrangement_clips")
-    @patch("core.get_track_muted")
-    @patch("core.get_track_is_foldable")
-    @patch("core.get_track_name")
-    @patch("core.get_track_count")
-    def test_get_all_tracks(
-        self,
-        mock_count: MagicMock,
-        mock_name: MagicMock,
-        mock_foldable: MagicMock,
-        mock_muted: MagicMock,
-        mock_clips: MagicMock,
-    ) -> None:
+    # OSC helpers used by the functions under test, patched once per test
+    # through a single patch.multiple rather than a stack of decorators
+    OSC_FUNCTIONS = (
+        "get_track_count",
+        "try_get_track_count",
+        "get_all_track_names",
+        "get_track_name",
+        "get_track_is_foldable",
+        "get_track_muted",
+        "get_arrangement_clips",
+        "select_track",
+        "wait_for_selected_track",
+        "set_loop_range",
+        "get_tempo",
+    )
+
+    def setUp(self) -> None:
+        patcher = patch.multiple("core", **{name: DEFAULT for name in self.OSC_FUNCTIONS})
+        self.mocks = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Track rows are read by osc_client.iter_track_rows, whose per-track
+        # fallback shares the mocks patched into core above
+        row_patcher = patch.multiple(
+            "osc_client",
+            get_tracks_bulk=DEFAULT,
+            **{name: self.mocks[name] for name in ROW_GETTERS},
+        )
+        self.mocks.update(row_patcher.start())
+        self.addCleanup(row_patcher.stop)
+
+    def test_get_all_tracks(self) -> None:
         """get_all_tracks should return list of TrackInfo."""
         mock_client = MagicMock()
-        mock_count.return_value = 2
-        mock_name.side_effect = ["Bass", "Drums Group"]
-        mock_foldable.side_effect = [False, True]
-        mock_muted.side_effect = [False, True]
-        mock_clips.return_value = []
+        self.mocks["get_track_count"].return_value = 2
+        self.mocks["get_tracks_bulk"].return_value = None
+        self.mocks["get_track_name"].side_effect = ["Bass", "Drums Group"]
+        self.mocks["get_track_is_foldable"].side_effect = [False, True]
+        self.mocks["get_track_muted"].side_effect = [False, True]
+        self.mocks["get_arrangement_clips"].return_value = []
 
         tracks = get_all_tracks(mock_client)
 
@@ -314,6 +392,74 @@ class TestTrackFunctions(unittest.TestCase):
         self.assertEqual(tracks[1].name, "Drums Group")
         self.assertEqual(tracks[1].track_type, TrackType.GROUP)
 
+    def test_get_all_tracks_counts_clips_in_order(self) -> None:
+        """Clip counts fetched concurrently should line up with their tracks."""
+        mock_clips = self.mocks["get_arrangement_clips"]
+        self.mocks["get_track_count"].return_value = 4
+        self.mocks["get_tracks_bulk"].return_value = [
+            ("Drums", True, 0), ("Kick", False, 0), ("Snare", False, 0), ("Hats", False, 1),
+        ]
+        clips = {1: [Clip("a", 0.0, 4.0)], 2: [], 3: [Clip("b", 0.0, 4.0), Clip("c", 4.0, 4.0)]}
+        mock_clips.side_effect = lambda client, i: clips[i]
+
+        tracks = get_all_tracks(MagicMock(), include_clips=True)
+
+        self.assertEqual([t.clip_count for t in tracks], [0, 1, 0, 2])
+        self.assertNotIn(0, [c.args[1] for c in mock_clips.call_args_list])
+
+    def test_get_track_details_spans_clips(self) -> None:
+        """get_track_details should report the range from first to last clip."""
+        mock_clips = self.mocks["get_arrangement_clips"]
+        self.mocks["get_tracks_bulk"].return_value = [("Bass", False, 0)]
+        mock_clips.return_value = [Clip("a", 4.0, 8.0), Clip("b", 16.0, 4.0)]
+
+        track = get_track_details(MagicMock(), 0, track_count=1)
+
+        self.assertEqual(track.clip_count, 2)
+        self.assertEqual((track.audio_start, track.audio_end), (4.0, 20.0))
+
+        mock_clips.return_value = []
+        track = get_track_details(MagicMock(), 0, track_count=1)
+        self.assertIsNone(track.audio_start)
+        self.assertIsNone(track.audio_end)
+
+    def test_get_all_tracks_uses_bulk_query(self) -> None:
+        """get_all_tracks should read tracks in batches when supported."""
+        mock_bulk = self.mocks["get_tracks_bulk"]
+        self.mocks["get_track_count"].return_value = 2
+        mock_bulk.return_value = [("Bass", False, 0), ("Drums Group", True, 1)]
+
+        tracks = get_all_tracks(MagicMock())
+
+        mock_bulk.assert_called_once()
+        self.mocks["get_track_name"].assert_not_called()
+        self.assertEqual([t.name for t in tracks], ["Bass", "Drums Group"])
+        self.assertEqual(tracks[1].track_type, TrackType.GROUP)
+        self.assertIs(tracks[1].muted, True)
+
+    @patch("core.get_all_tracks")
+    def test_get_all_tracks_or_error_uses_count_as_probe(self, mock_all_tracks: MagicMock) -> None:
+        """get_all_tracks_or_error should reuse the probed track count."""
+        mock_client = MagicMock()
+        self.mocks["try_get_track_count"].return_value = 3
+        mock_all_tracks.return_value = []
+
+        result = get_all_tracks_or_error(mock_client)
+
+        self.assertEqual(result, [])
+        mock_all_tracks.assert_called_once_with(
+            mock_client, include_clips=False, track_count=3
+        )
+
+    def test_get_all_tracks_or_error_disconnected(self) -> None:
+        """get_all_tracks_or_error should return a status when Live is silent."""
+        self.mocks["try_get_track_count"].return_value = None
+
+        result = get_all_tracks_or_error(MagicMock())
+
+        self.assertIsInstance(result, ConnectionStatus)
+        self.assertFalse(result.connected)
+
     @patch("core.get_all_tracks")
     def test_get_groups(self, mock_all_tracks: MagicMock) -> None:
         """get_groups should filter to only group tracks."""
@@ -329,53 +475,324 @@ class TestTrackFunctions(unittest.TestCase):
         self.assertEqual(len(groups), 1)
         self.assertEqual(groups[0].name, "Drums")
 
-    @patch("core.get_all_tracks")
-    def test_find_tracks_by_name(self, mock_all_tracks: MagicMock) -> None:
+    def test_find_tracks_by_name(self) -> None:
         """find_tracks_by_name should filter by partial match."""
         mock_client = MagicMock()
-        mock_all_tracks.return_value = [
-            TrackInfo(0, "Bass", TrackType.TRACK, False),
-            TrackInfo(1, "Sub Bass", TrackType.TRACK, False),
-            TrackInfo(2, "Lead", TrackType.TRACK, False),
-        ]
+        mock_bulk = self.mocks["get_tracks_bulk"]
+        self.mocks["get_all_track_names"].return_value = ["Bass", "Sub Bass", "Lead"]
+        mock_bulk.return_value = [(0, 0), (1, 1)]
 
         matches = find_tracks_by_name(mock_client, "bass")
 
         self.assertEqual(len(matches), 2)
         self.assertEqual(matches[0].name, "Bass")
         self.assertEqual(matches[1].name, "Sub Bass")
+        self.assertEqual(matches[1].index, 1)
+        self.assertEqual(matches[1].track_type, TrackType.GROUP)
+        self.assertIs(matches[1].muted, True)
+        # Only the matching tracks should be read, in one bulk query
+        mock_bulk.assert_called_once_with(mock_client, 0, 2, ("is_foldable", "mute"))
+        self.mocks["get_track_is_foldable"].assert_not_called()
+
+    def test_find_tracks_by_name_reads_scattered_hits_in_one_span(self) -> None:
+        """Scattered hits should cost one bulk read, not one per hit."""
+        mock_client = MagicMock()
+        mock_bulk = self.mocks["get_tracks_bulk"]
+        self.mocks["get_all_track_names"].return_value = ["Bass", "Kick", "Bass 2", "Hat", "Bass 3"]
+        mock_bulk.return_value = [(0, 0)] * 5
 
-    @patch("core.select_track")
-    @patch("core.get_track_name")
-    @patch("core.get_track_count")
-    def test_select_track_by_index_success(
-        self,
-        mock_count: MagicMock,
-        mock_name: MagicMock,
-        mock_select: MagicMock,
-    ) -> None:
+        matches = find_tracks_by_name(mock_client, "bass")
+
+        self.assertEqual([t.index for t in matches], [0, 2, 4])
+        mock_bulk.assert_called_once_with(mock_client, 0, 5, ("is_foldable", "mute"))
+
+    def test_find_tracks_by_name_in_fetched_tracks(self) -> None:
+        """find_tracks_by_name should search pre-fetched tracks without querying."""
+        mock_client = MagicMock()
+        tracks = [
+            TrackInfo(0, "Bass", TrackType.TRACK, False),
+            TrackInfo(2, "Lead", TrackType.TRACK, False),
+        ]
+
+        matches = find_tracks_by_name(mock_client, "LEAD", tracks=tracks)
+
+        self.assertEqual([t.index for t in matches], [2])
+        mock_client.query.assert_not_called()
+        self.mocks["get_all_track_names"].assert_not_called()
+
+    def test_select_track_by_index_success(self) -> None:
         """select_track_by_index should succeed for valid index."""
         mock_client = MagicMock()
-        mock_count.return_value = 10
-        mock_name.return_value = "Bass"
+        self.mocks["get_track_count"].return_value = 10
+        self.mocks["get_track_name"].return_value = "Bass"
 
         success, message = select_track_by_index(mock_client, 5)
 
         self.assertTrue(success)
         self.assertIn("Bass", message)
-        mock_select.assert_called_once_with(mock_client, 5)
+        self.mocks["select_track"].assert_called_once_with(mock_client, 5)
 
-    @patch("core.get_track_count")
-    def test_select_track_by_index_invalid(self, mock_count: MagicMock) -> None:
+    def test_select_track_by_index_invalid(self) -> None:
         """select_track_by_index should fail for invalid index."""
         mock_client = MagicMock()
-        mock_count.return_value = 5
+        self.mocks["get_track_count"].return_value = 5
 
         success, message = select_track_by_index(mock_client, 10)
 
         self.assertFalse(success)
         self.assertIn("Invalid", message)
 
+    def test_set_export_range_uses_known_tempo(self) -> None:
+        """set_export_range should not query the tempo when it is passed in."""
+        message = set_export_range(MagicMock(), 0.0, 64.0, tempo=128.0)
+
+        self.mocks["get_tempo"].assert_not_called()
+        self.assertIn("30.0 seconds at 128 BPM", message)
+
+
+class TestUnsupportedBulkQuery(unittest.TestCase):
+    """Test falling back when AbletonOSC lacks the bulk track query."""
+
+    def setUp(self) -> None:
+        # A client without its UDP receiver; only query() is exercised
+        self.client = AbletonOSCClient.__new__(AbletonOSCClient)
+        self.client._supported = set()
+        self.client._unsupported = set()
+        self.client._optional_misses = {}
+        self.live_answers = True
+
+        def respond(address: str, *args, **kwargs):
+            if address == "/live/song/get/track_data":
+                return None
+            if address == "/live/test":
+                return ("ok",) if self.live_answers else None
+            index = args[0]
+            return (index, f"Track {index}") if address.endswith("/name") else (index, 0)
+
+        self.client.query = MagicMock(side_effect=respond)
+
+    def bulk_calls(self) -> list:
+        """Calls made to the bulk track query so far."""
+        return [c for c in self.client.query.call_args_list if c.args[0] == "/live/song/get/track_data"]
+
+    def test_bulk_query_is_given_up_after_repeated_misses(self) -> None:
+        """A bulk query Live keeps ignoring shouldn't be waited on again."""
+        for _ in range(3):
+            tracks = get_all_tracks(self.client, track_count=2)
+            self.assertEqual([t.name for t in tracks], ["Track 0", "Track 1"])
+
+        self.assertEqual(len(self.bulk_calls()), 2)
+        self.assertTrue(all(c.kwargs["timeout"] == 0.5 for c in self.bulk_calls()))
+
+    def test_misses_while_live_is_unresponsive_do_not_count(self) -> None:
+        """A busy Live that answers nothing shouldn't lose the bulk query."""
+        self.live_answers = False
+        for _ in range(3):
+            get_all_tracks(self.client, track_count=2)
+
+        self.assertEqual(len(self.bulk_calls()), 3)
+        self.assertTrue(bulk_track_data_supported(self.client))
+
+    def test_failed_connection_check_resets_probing(self) -> None:
+        """Losing the connection should let the bulk query be tried again."""
+        for _ in range(2):
+            get_all_tracks(self.client, track_count=2)
+        self.assertFalse(bulk_track_data_supported(self.client))
+
+        self.live_answers = False
+        self.assertFalse(self.client.test_connection())
+        self.assertTrue(bulk_track_data_supported(self.client))
+
+
+class TestResponseRouting(unittest.TestCase):
+    """Test matching OSC replies to the queries waiting for them."""
+
+    def setUp(self) -> None:
+        # A client without its UDP receiver; replies are fed in directly
+        self.client = AbletonOSCClient.__new__(AbletonOSCClient)
+        self.client._pending = {}
+        self.client._pending_lock = threading.Lock()
+
+    def wait_for(self, address: str, *args) -> _PendingQuery:
+        """Register a query as waiting for its reply."""
+        pending = _PendingQuery(args)
+        self.client._pending.setdefault(address, []).append(pending)
+        return pending
+
+    def test_late_reply_for_other_track_is_dropped(self) -> None:
+        """A timed-out query's reply must not reach a query about another track."""
+        pending = self.wait_for("/live/track/get/arrangement_clips/start_time", 3)
+        self.client._handle_response("/live/track/get/arrangement_clips/start_time", 1, 0.0, 16.0)
+        self.assertIsNone(pending.response)
+
+        self.client._handle_response("/live/track/get/arrangement_clips/start_time", 3, 8.0)
+        self.assertEqual(pending.response, (3, 8.0))
+
+    def test_unechoed_reply_goes_to_oldest_query(self) -> None:
+        """Bulk replies don't echo their range, so the oldest query takes them."""
+        first = self.wait_for(TRACK_DATA_ADDRESS, 0, 2, "track.name")
+        second = self.wait_for(TRACK_DATA_ADDRESS, 2, 4, "track.name")
+        self.client._handle_response(TRACK_DATA_ADDRESS, "Kick", "Snare")
+        self.assertEqual(first.response, ("Kick", "Snare"))
+        self.assertIsNone(second.response)
+
+
+class TestArrangementAudioRange(unittest.TestCase):
+    """Test audio range detection across tracks."""
+
+    def setUp(self) -> None:
+        patcher = patch("core.get_beats_per_bar", return_value=4.0)
+        self.mock_beats_per_bar = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("core.get_tempo")
+    @patch("core.get_track_audio_bounds")
+    @patch("osc_client.get_tracks_bulk")
+    @patch("core.get_track_count")
+    def test_spans_unmuted_non_group_tracks(
+        self,
+        mock_count: MagicMock,
+        mock_bulk: MagicMock,
+        mock_bounds: MagicMock,
+        mock_tempo: MagicMock,
+    ) -> None:
+        """Range should cover every eligible track's clips, fetched concurrently."""
+        mock_count.return_value = 6
+        # (mute, is_foldable) per track: track 1 muted, track 2 a group
+        mock_bulk.return_value = [(0, 0), (1, 0), (0, 1), (0, 0), (0, 0), (0, 0)]
+        bounds = {0: (8.0, 12.0), 3: (4.0, 24.0), 4: None, 5: (12.0, 16.0)}
+        mock_bounds.side_effect = lambda client, i: bounds[i]
+        mock_tempo.return_value = 120.0
+
+        audio_range = get_arrangement_audio_range(MagicMock())
+
+        self.assertEqual(sorted(c.args[1] for c in mock_bounds.call_args_list), [0, 3, 4, 5])
+        self.assertEqual(audio_range.start_beats, 4.0)
+        self.assertEqual(audio_range.end_beats, 24.0)
+        self.assertEqual(audio_range.start_bar, 2)
+        self.assertEqual(audio_range.length_bars, 5)
+        self.assertEqual(audio_range.duration_seconds, 10.0)
+
+    @patch("core.get_tempo")
+    @patch("core.get_track_audio_bounds")
+    @patch("osc_client.get_tracks_bulk")
+    @patch("core.get_track_count")
+    def test_scan_arrangement_reads_key_and_range_in_one_pass(
+        self,
+        mock_count: MagicMock,
+        mock_bulk: MagicMock,
+        mock_bounds: MagicMock,
+        mock_tempo: MagicMock,
+    ) -> None:
+        """scan_arrangement should take the key from the first keyed group."""
+        mock_count.return_value = 4
+        # (name, mute, is_foldable) per track
+        mock_bulk.return_value = [
+            ("Drums", 0, 1),
+            ("Keys Fmin 128", 0, 1),
+            ("Kick", 0, 0),
+            ("Pad", 1, 0),
+        ]
+        mock_bounds.return_value = (0.0, 32.0)
+        mock_tempo.return_value = 128.0
+
+        audio_range, key = scan_arrangement(MagicMock())
+
+        mock_bulk.assert_called_once()
+        self.assertEqual(mock_bounds.call_args.args[1], 2)
+        self.assertEqual(key, "Fmin")
+        self.assertEqual(audio_range.length_bars, 8)
+
+    @patch("osc_client.get_track_is_foldable")
+    @patch("osc_client.get_track_name")
+    @patch("core.get_track_audio_bounds")
+    @patch("osc_client.get_tracks_bulk")
+    def test_scan_arrangement_key_only_stops_at_first_keyed_group(
+        self,
+        mock_bulk: MagicMock,
+        mock_bounds: MagicMock,
+        mock_name: MagicMock,
+        mock_foldable: MagicMock,
+    ) -> None:
+        """Without a range to detect, tracks after the keyed group aren't read."""
+        mock_bulk.return_value = None
+        mock_name.side_effect = ["Drums", "Keys Fmin 128", "Kick", "Pad"]
+        mock_foldable.side_effect = [True, True, False, False]
+
+        audio_range, key = scan_arrangement(MagicMock(), include_range=False, track_count=4)
+
+        self.assertIsNone(audio_range)
+        self.assertEqual(key, "Fmin")
+        self.assertEqual(mock_name.call_count, 2)
+        mock_bounds.assert_not_called()
+
+    @patch("core.get_track_audio_bounds")
+    @patch("osc_client.get_tracks_bulk")
+    def test_bars_cover_off_grid_clips(
+        self,
+        mock_bulk: MagicMock,
+        mock_bounds: MagicMock,
+    ) -> None:
+        """A range that starts mid-bar or has a fractional length keeps its last bar."""
+        mock_bulk.return_value = [(0, 0)]
+        for (start, end), (start_bar, length_bars) in [
+            ((3.0, 5.0), (1, 2)),
+            ((0.0, 16.5), (1, 5)),
+            ((4.0, 8.0), (2, 1)),
+        ]:
+            with self.subTest(start=start, end=end):
+                mock_bounds.return_value = (start, end)
+                audio_range = get_arrangement_audio_range(MagicMock(), tempo=120.0, track_count=1)
+                self.assertEqual(audio_range.start_bar, start_bar)
+                self.assertEqual(audio_range.length_bars, length_bars)
+
+    @patch("core.get_track_audio_bounds")
+    @patch("osc_client.get_tracks_bulk")
+    def test_bars_follow_time_signature(
+        self,
+        mock_bulk: MagicMock,
+        mock_bounds: MagicMock,
+    ) -> None:
+        """Bars should be counted in the song's meter, not assumed 4/4."""
+        mock_bulk.return_value = [(0, 0)]
+        # Mid-bar start with a fractional length, in 3/4 and 2/4
+        mock_bounds.return_value = (4.5, 11.25)
+        for beats_per_bar, (start_bar, length_bars) in [(3.0, (2, 3)), (2.0, (3, 4))]:
+            with self.subTest(beats_per_bar=beats_per_bar):
+                self.mock_beats_per_bar.return_value = beats_per_bar
+                audio_range = get_arrangement_audio_range(MagicMock(), tempo=120.0, track_count=1)
+                self.assertEqual(audio_range.start_bar, start_bar)
+                self.assertEqual(audio_range.length_bars, length_bars)
+
+    def test_beats_per_bar_from_signature(self) -> None:
+        """A bar's length in quarter-note beats depends on both signature parts."""
+        client = MagicMock()
+        for signature, beats in [((4, 4), 4.0), ((3, 4), 3.0), ((6, 8), 3.0), ((7, 8), 3.5)]:
+            with self.subTest(signature=signature):
+                client.query.side_effect = [(signature[0],), (signature[1],)]
+                self.assertEqual(get_beats_per_bar(client), beats)
+
+    @patch("core.get_tempo")
+    @patch("core.get_track_audio_bounds")
+    @patch("osc_client.get_tracks_bulk")
+    @patch("core.get_track_count")
+    def test_known_tempo_and_count_are_not_queried(
+        self,
+        mock_count: MagicMock,
+        mock_bulk: MagicMock,
+        mock_bounds: MagicMock,
+        mock_tempo: MagicMock,
+    ) -> None:
+        """Values from the connection check should be reused."""
+        mock_bulk.return_value = [(0, 0)]
+        mock_bounds.return_value = (0.0, 16.0)
+
+        audio_range = get_arrangement_audio_range(MagicMock(), tempo=60.0, track_count=1)
+
+        mock_count.assert_not_called()
+        mock_tempo.assert_not_called()
+        self.assertEqual(audio_range.duration_seconds, 16.0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,17 +2,31 @@
 Export orchestrator - ties together OSC and GUI automation.
 """
 
+import sys
 import time
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass
 
-from osc_client import AbletonOSCClient, select_track, set_loop_range, get_tempo
+from osc_client import (
+    AbletonOSCClient,
+    select_track,
+    set_loop_range,
+    get_tempo,
+    wait_for_loop_range,
+    wait_for_selected_track,
+)
 from track_analyzer import TrackAnalyzer, Group, Track, ViewType
-from gui_automation import AbletonExportAutomation, activate_ableton
+from gui_automation import AbletonExportAutomation
 
+# Seconds a track structure scan is reused before Live is queried again
+REFRESH_TTL = 30.0
 
-@dataclass
+# Seconds a queried tempo is reused across exports
+TEMPO_TTL = 5.0
+
+
+@dataclass(slots=True, frozen=True)
 class ExportResult:
     """Result of an export operation."""
     track_name: str
@@ -53,10 +67,45 @@ class AbletonExporter:
         # Initialize GUI automation
         self.automation = AbletonExportAutomation(output_folder)
 
-    def refresh(self) -> None:
-        """Refresh track data from Live."""
+        # time.monotonic() of the last structure scan, None when stale
+        self._last_refresh: Optional[float] = None
+        self._tempo: Optional[float] = None
+        self._tempo_time = 0.0
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Refresh track data from Live.
+
+        A scan less than REFRESH_TTL seconds old is reused, so scripted
+        exports from the same set don't re-query every track each time.
+
+        Args:
+            force: Rescan even if the last scan is still fresh
+        """
+        if (
+            not force
+            and self._last_refresh is not None
+            and time.monotonic() - self._last_refresh < REFRESH_TTL
+        ):
+            return
+
         print("Analyzing track structure...")
         self.analyzer.refresh()
+        self._last_refresh = time.monotonic()
+        self._tempo = None
+
+    def invalidate(self) -> None:
+        """Mark the track data stale, e.g. after editing the set in Live."""
+        self._last_refresh = None
+        self._tempo = None
+
+    def _get_tempo_cached(self) -> float:
+        """Get the Live tempo, reusing a value queried within TEMPO_TTL seconds."""
+        now = time.monotonic()
+        if self._tempo is None or now - self._tempo_time >= TEMPO_TTL:
+            self._tempo = get_tempo(self.osc_client)
+            self._tempo_time = now
+        return self._tempo
 
     def export_group(
         self,
@@ -115,7 +164,7 @@ class AbletonExporter:
                 print("ERROR: Must specify start_beats and length_beats when auto_range is False")
                 return []
 
-        tempo = get_tempo(self.osc_client)
+        tempo = self._get_tempo_cached()
         duration_seconds = (length_beats / tempo) * 60
 
         print(f"\nExport range: {start_beats:.1f} - {start_beats + length_beats:.1f} beats")
@@ -124,20 +173,20 @@ class AbletonExporter:
         # Set the loop range for export
         print("Setting export range...")
         set_loop_range(self.osc_client, start_beats, length_beats)
-        time.sleep(0.5)
+        wait_for_loop_range(self.osc_client, start_beats, length_beats)
 
-        # Bring Ableton to foreground
-        activate_ableton()
-        time.sleep(0.5)
+        # No separate activation here: every automation.export_track() call
+        # brings Ableton to the foreground before opening the export dialog
 
         # Export each track
         results = []
         for i, track in enumerate(tracks_to_export):
             print(f"\n[{i + 1}/{len(tracks_to_export)}] Exporting: {track.name}")
 
-            # Select the track via OSC
-            select_track(self.osc_client, track.index)
-            time.sleep(0.3)
+            # Later tracks were already selected during the previous wait
+            if i == 0:
+                select_track(self.osc_client, track.index)
+                wait_for_selected_track(self.osc_client, track.index)
 
             # Trigger export via GUI automation
             success = self.automation.export_track(
@@ -152,24 +201,29 @@ class AbletonExporter:
                 output_path=self.output_folder / f"{track.name}.wav" if success else None,
             ))
 
-            # Wait between exports
+            # Select the next track now, so the OSC round trips overlap the
+            # wait between exports instead of following it
             if i < len(tracks_to_export) - 1:
                 print(f"  Waiting {delay_between_exports}s before next export...")
-                time.sleep(delay_between_exports)
+                deadline = time.monotonic() + delay_between_exports
+                next_track = tracks_to_export[i + 1]
+                select_track(self.osc_client, next_track.index)
+                wait_for_selected_track(self.osc_client, next_track.index)
+                time.sleep(max(0.0, deadline - time.monotonic()))
 
-        # Print summary
-        print("\n" + "=" * 50)
-        print("EXPORT SUMMARY")
-        print("=" * 50)
-        successful = [r for r in results if r.success]
+        # Print summary in one write
         failed = [r for r in results if not r.success]
-        print(f"Successful: {len(successful)}")
-        print(f"Failed: {len(failed)}")
-
+        lines = [
+            "\n" + "=" * 50,
+            "EXPORT SUMMARY",
+            "=" * 50,
+            f"Successful: {len(results) - len(failed)}",
+            f"Failed: {len(failed)}",
+        ]
         if failed:
-            print("\nFailed tracks:")
-            for r in failed:
-                print(f"  - {r.track_name}: {r.error or 'Unknown error'}")
+            lines.append("\nFailed tracks:")
+            lines.extend(f"  - {r.track_name}: {r.error or 'Unknown error'}" for r in failed)
+        sys.stdout.write("\n".join(lines) + "\n")
 
         return results
 
@@ -212,10 +266,11 @@ class AbletonExporter:
         # Set range and select track
         set_loop_range(self.osc_client, start_beats, length_beats)
         select_track(self.osc_client, track.index)
-        time.sleep(0.5)
+        wait_for_loop_range(self.osc_client, start_beats, length_beats)
+        wait_for_selected_track(self.osc_client, track.index)
 
         # Export
-        tempo = get_tempo(self.osc_client)
+        tempo = self._get_tempo_cached()
         duration_seconds = (length_beats / tempo) * 60
 
         success = self.automation.export_track(
@@ -233,10 +288,12 @@ class AbletonExporter:
     def list_groups(self) -> None:
         """List all groups in the Live set."""
         self.refresh()
-        print("\nGroups in Live set:")
-        for group in self.analyzer.groups:
-            enabled_count = len(group.enabled_tracks_with_audio)
-            print(f"  - {group.track.name} ({enabled_count} enabled tracks with audio)")
+        lines = ["\nGroups in Live set:"]
+        lines.extend(
+            f"  - {group.track.name} ({len(group.enabled_tracks_with_audio)} enabled tracks with audio)"
+            for group in self.analyzer.groups
+        )
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def list_tracks(self) -> None:
         """List all tracks in the Live set."""
@@ -4,26 +4,54 @@ GUI automation for Ableton Live export dialog.
 Uses AppleScript on macOS, PyAutoGUI as fallback.
 """
 
+import atexit
+import os
 import subprocess
+import tempfile
+import threading
 import time
 import platform
 from pathlib import Path
 from typing import Optional
 
-# Quartz imports for low-level mouse control (macOS only)
+# Quartz imports for low-level mouse and keyboard control (macOS only)
 from Quartz import (
     CGEventCreateMouseEvent, CGEventPost, CGEventSetIntegerValueField,
     kCGEventMouseMoved, kCGEventLeftMouseDown, kCGEventLeftMouseUp,
-    kCGHIDEventTap, kCGMouseEventClickState
+    kCGHIDEventTap, kCGMouseEventClickState,
+    CGEventCreateKeyboardEvent, CGEventSetFlags,
+    kCGEventFlagMaskCommand, kCGEventFlagMaskShift
 )
 
+# In-process AppleScript (macOS only); osascript is used when it's unavailable
+try:
+    from Foundation import NSAppleEventDescriptor, NSAppleScript
+except ImportError:
+    NSAppleEventDescriptor = NSAppleScript = None
+
 # Dialog window name constants
 SAFE_DIALOG_WINDOWS = frozenset(["Save", "Export Audio/Video", "Export"])
 EXPORT_DIALOG_PREFIX = "Export"
 SAVE_DIALOG_NAME = "Save"
 
+# Application to activate, and the name its process runs under
+ABLETON_APP_NAME = "Ableton Live 12 Suite"
+ABLETON_PROCESS_NAME = "Live"
+
+# Pause between repeated key presses: enough for Live's dialogs to keep up
+KEY_REPEAT_DELAY = 0.02
+
+# Virtual key codes for keys posted directly as Quartz events
+KEY_CODE_R = 15
+KEY_CODE_RETURN = 36
+KEY_CODE_TAB = 48
+KEY_CODE_SPACE = 49
+KEY_CODE_ESCAPE = 53
+KEY_CODE_DOWN_ARROW = 125
+
 # Filename sanitization
 INVALID_FILENAME_CHARS = '<>:"/\\|?*'
+_FILENAME_TRANS = str.maketrans({char: "_" for char in INVALID_FILENAME_CHARS})
 
 
 class ExportError(Exception):
@@ -69,16 +97,156 @@ def wait_for_window_change(
     raise TimeoutError(f"Window did not change from '{initial_window}' within {timeout}s")
 
 
-def run_applescript(script: str) -> tuple[bool, str]:
+def wait_for_dialog(
+    prefix: str,
+    timeout: float = 3.0,
+    interval: float = 0.05
+) -> tuple[bool, str]:
     """
-    Run an AppleScript and return success status and output.
+    Poll until the front window name contains prefix.
+
+    Returns as soon as the dialog is up instead of sleeping for the
+    worst-case time it takes Live to draw it.
+
+    Args:
+        prefix: Text the dialog's window name must contain
+        timeout: Maximum time to wait in seconds
+        interval: Time between polls in seconds
+
+    Returns:
+        (found, window_name) - window_name is the last front window seen
+    """
+    deadline = time.time() + timeout
+    while True:
+        _, window_name = verify_in_dialog()
+        if prefix in window_name:
+            return True, window_name
+        if time.time() >= deadline:
+            return False, window_name
+        time.sleep(interval)
+
+
+def wait_for_file_stable(
+    path: Path,
+    timeout: float,
+    before: Optional[os.stat_result] = None,
+    quiet: float = 0.5,
+    interval: float = 0.1,
+) -> bool:
+    """
+    Poll until path exists and has stopped growing.
+
+    Used to detect that Live has finished writing an export, instead of
+    sleeping for a fixed time.
+
+    Args:
+        path: File to wait for
+        timeout: Maximum time to wait in seconds
+        before: Stat of path taken before the export, if it existed. The
+            file is ignored until its inode, size or mtime differ, so an older
+            file being overwritten doesn't count as done. Comparing stats
+            rather than wall-clock time also works on filesystems with coarse
+            mtimes (1s on HFS+, 2s on FAT)
+        quiet: How long the size must stay unchanged, in seconds
+        interval: Time between polls in seconds
+
+    Returns:
+        True once the file is stable, False on timeout
+    """
+    old = None if before is None else (before.st_ino, before.st_size, before.st_mtime_ns)
+    deadline = time.time() + timeout
+    last_size = None
+    stable_since = 0.0
+    while True:
+        now = time.time()
+        try:
+            stat = path.stat()
+        except OSError:
+            stat = None
+
+        if stat is not None and (stat.st_ino, stat.st_size, stat.st_mtime_ns) != old:
+            if stat.st_size != last_size:
+                last_size = stat.st_size
+                stable_since = now
+            elif now - stable_since >= quiet:
+                return True
+
+        if now >= deadline:
+            return False
+        time.sleep(interval)
+
+
+def _fourcc(code: str) -> int:
+    """Convert a four-character Apple Event code to its integer value."""
+    return int.from_bytes(code.encode("ascii"), "big")
+
+
+# Descriptor types AppleScript uses for true/false results
+_BOOLEAN_DESCRIPTOR_TYPES = frozenset(map(_fourcc, ("bool", "true", "fals")))
+
+
+def _compile_in_process(source: str):
     """
+    Compile source into an NSAppleScript, or return None if it won't compile.
+
+    Only call this where _can_run_in_process() holds.
+    """
+    assert threading.current_thread() is threading.main_thread(), "NSAppleScript is main-thread only"
+    script = NSAppleScript.alloc().initWithSource_(source)
+    compiled, _ = script.compileAndReturnError_(None)
+    return script if compiled else None
+
+
+def _descriptor_text(descriptor) -> str:
+    """Render a script result the way osascript prints it."""
+    if descriptor is None:
+        return ""
+    if descriptor.descriptorType() in _BOOLEAN_DESCRIPTOR_TYPES:
+        return "true" if descriptor.booleanValue() else "false"
+    return (descriptor.stringValue() or "").strip()
+
+
+def _can_run_in_process() -> bool:
+    """Whether NSAppleScript is available here; it may only be used from the main thread."""
+    return NSAppleScript is not None and threading.current_thread() is threading.main_thread()
+
+
+def _run_in_process(script, args: tuple[str, ...] = ()) -> tuple[bool, str]:
+    """
+    Run a compiled NSAppleScript instead of spawning osascript.
+
+    args are passed to the script's run handler as argv, the same way
+    osascript passes its extra arguments.
+
+    Returns:
+        (success, output) tuple
+    """
+    if args:
+        # A "run" (open application) event whose direct parameter is argv
+        event = NSAppleEventDescriptor.appleEventWithEventClass_eventID_targetDescriptor_returnID_transactionID_(
+            _fourcc("aevt"), _fourcc("oapp"), NSAppleEventDescriptor.nullDescriptor(), -1, 0
+        )
+        argv = NSAppleEventDescriptor.listDescriptor()
+        for position, arg in enumerate(args, start=1):
+            argv.insertDescriptor_atIndex_(NSAppleEventDescriptor.descriptorWithString_(arg), position)
+        event.setParamDescriptor_forKeyword_(argv, _fourcc("----"))
+        result, error = script.executeAppleEvent_error_(event, None)
+    else:
+        result, error = script.executeAndReturnError_(None)
+
+    if error is not None:
+        return False, str(error.get("NSAppleScriptErrorMessage", ""))
+    return True, _descriptor_text(result)
+
+
+def _run_osascript(args: list[str], timeout: float = 30) -> tuple[bool, str]:
+    """Run osascript with the given arguments and return success status and output."""
     try:
         result = subprocess.run(
-            ["osascript", "-e", script],
+            ["osascript", *args],
             capture_output=True,
             text=True,
-            timeout=30,
+            timeout=timeout,
         )
         return result.returncode == 0, result.stdout.strip()
     except subprocess.TimeoutExpired:
@@ -89,44 +257,176 @@ def run_applescript(script: str) -> tuple[bool, str]:
         return False, f"OS error: {e}"
 
 
-def activate_ableton() -> bool:
-    """Bring Ableton Live to the foreground."""
-    script = '''
-    tell application "Ableton Live 12 Suite"
-        activate
-    end tell
-    delay 0.5
-    '''
-    success, _ = run_applescript(script)
-    return success
+def run_applescript(script: str) -> tuple[bool, str]:
+    """
+    Run an AppleScript and return success status and output.
 
+    Runs in-process through NSAppleScript where possible, falling back to
+    osascript. The source is compiled on every call; fixed scripts that run
+    repeatedly should be CompiledScripts instead.
+    """
+    if _can_run_in_process():
+        compiled = _compile_in_process(script)
+        if compiled is not None:
+            return _run_in_process(compiled)
+    return _run_osascript(["-e", script])
 
-def open_export_dialog() -> bool:
+
+class CompiledScript:
     """
-    Open the Export Audio/Video dialog using Cmd+Shift+R.
+    A fixed AppleScript that is compiled once and then reused.
+
+    The script runs in-process through NSAppleScript where possible. When
+    it has to go through osascript (no PyObjC, or off the main thread), it
+    is compiled with osacompile the first time instead of having osascript
+    -e parse the source on every call. If compiling fails, the source is
+    run as-is.
+
+    Values that vary between calls are passed as arguments to the script's
+    "on run argv" handler rather than formatted into the source, which also
+    means they never need AppleScript string escaping.
     """
-    script = '''
-    tell application "Ableton Live 12 Suite" to activate
-    delay 0.5
+
+    def __init__(self, source: str):
+        self.source = source
+        self._path: Optional[str] = None
+        self._compile_failed = False
+        # The NSAppleScript, only ever touched on the main thread
+        self._ns_script = None
+        self._ns_compile_failed = False
+
+    def _compile_ns_script(self):
+        """Compile the in-process script on first use; None if it won't compile."""
+        if self._ns_script is None and not self._ns_compile_failed:
+            self._ns_script = _compile_in_process(self.source)
+            self._ns_compile_failed = self._ns_script is None
+        return self._ns_script
+
+    def _compile(self) -> Optional[str]:
+        """Compile the script on first use and return the .scpt path, if any."""
+        if self._path is not None or self._compile_failed:
+            return self._path
+
+        fd, path = tempfile.mkstemp(prefix="ableton_mcp_", suffix=".scpt")
+        os.close(fd)
+        try:
+            result = subprocess.run(
+                ["osacompile", "-o", path, "-e", self.source],
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+            compiled = result.returncode == 0
+        except (subprocess.SubprocessError, OSError):
+            compiled = False
+
+        if not compiled:
+            os.unlink(path)
+            self._compile_failed = True
+            return None
+
+        atexit.register(_remove_file, path)
+        self._path = path
+        return path
+
+    def prepare(self) -> None:
+        """Compile the script now so its first run doesn't pay for it."""
+        if _can_run_in_process():
+            self._compile_ns_script()
+        else:
+            self._compile()
+
+    def run(self, *args: str, timeout: float = 30) -> tuple[bool, str]:
+        """
+        Run the script with args as its argv and return success status and output.
+
+        timeout only applies when the script goes through osascript.
+        """
+        if _can_run_in_process():
+            script = self._compile_ns_script()
+            if script is not None:
+                return _run_in_process(script, args)
+
+        path = self._compile()
+        if path is None:
+            return _run_osascript(["-e", self.source, *args], timeout=timeout)
+        return _run_osascript([path, *args], timeout=timeout)
+
+
+def _remove_file(path: str) -> None:
+    """Delete a file, ignoring it if it is already gone."""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+# Activates Live and polls System Events until it is frontmost, since
+# NSWorkspace's view of the frontmost app only updates on a main run loop
+# that the CLI and MCP server don't run. argv: maximum wait in seconds.
+_ACTIVATE_SCRIPT = CompiledScript(f'''
+on run argv
+    set maxWait to (item 1 of argv) as real
+    tell application "{ABLETON_APP_NAME}" to activate
+    set waited to 0
     tell application "System Events"
-        tell process "Live"
-            keystroke "r" using {shift down, command down}
-        end tell
+        repeat
+            if exists process "{ABLETON_PROCESS_NAME}" then
+                if frontmost of process "{ABLETON_PROCESS_NAME}" then return "true"
+            end if
+            if waited >= maxWait then return "false"
+            delay 0.05
+            set waited to waited + 0.05
+        end repeat
     end tell
-    delay 1.5
-    '''
-    success, _ = run_applescript(script)
-    return success
+end run
+''')
 
 
-def wait_for_export_dialog(timeout: float = 5.0) -> bool:
+def _post_key(key_code: int, flags: int = 0) -> None:
     """
-    Wait for the export dialog to appear.
+    Press and release a key by posting Quartz keyboard events.
 
-    Note: Ableton uses non-native windows, so dialogs appear as window ""
+    Goes to the frontmost app like a System Events keystroke, but without
+    running an AppleScript for it.
+    """
+    for key_down in (True, False):
+        event = CGEventCreateKeyboardEvent(None, key_code, key_down)
+        if flags:
+            CGEventSetFlags(event, flags)
+        CGEventPost(kCGHIDEventTap, event)
+
+
+def activate_ableton(timeout: float = 3.0) -> bool:
+    """
+    Bring Ableton Live to the foreground.
+
+    Returns as soon as Live is frontmost, waiting at most timeout seconds,
+    which leaves room for Live to come forward while it is busy.
+
+    Returns:
+        True if Live is frontmost afterwards
+    """
+    success, output = _ACTIVATE_SCRIPT.run(str(timeout), timeout=timeout + 10)
+    return success and output == "true"
+
+
+def open_export_dialog(activate: bool = True) -> bool:
     """
-    script = f'''
-    set maxWait to {timeout}
+    Open the Export Audio/Video dialog using Cmd+Shift+R.
+
+    Pass activate=False when Live has just been brought to the front.
+    """
+    if activate and not activate_ableton():
+        return False
+    _post_key(KEY_CODE_R, kCGEventFlagMaskCommand | kCGEventFlagMaskShift)
+    return True
+
+
+# argv: maximum wait in seconds
+_WAIT_FOR_EXPORT_DIALOG_SCRIPT = CompiledScript('''
+on run argv
+    set maxWait to (item 1 of argv) as real
     set waited to 0
     tell application "System Events"
         repeat while waited < maxWait
@@ -138,83 +438,88 @@ def wait_for_export_dialog(timeout: float = 5.0) -> bool:
         end repeat
     end tell
     return false
-    '''
-    success, output = run_applescript(script)
+end run
+''')
+
+
+def wait_for_export_dialog(timeout: float = 5.0) -> bool:
+    """
+    Wait for the export dialog to appear.
+
+    Note: Ableton uses non-native windows, so dialogs appear as window ""
+    """
+    success, output = _WAIT_FOR_EXPORT_DIALOG_SCRIPT.run(str(timeout))
     return success and output == "true"
 
 
-def close_dialog_with_escape() -> bool:
-    """Close any open dialog with Escape key."""
-    script = '''
-    tell application "System Events"
-        key code 53
+# Buttons 1-9 of the Export dialog are checkboxes, 10 is Export, 11 is Cancel
+_CLICK_EXPORT_BUTTON_SCRIPT = CompiledScript('''
+tell application "System Events"
+    tell process "Live"
+        tell front window
+            tell group 1
+                click button 10
+            end tell
+        end tell
     end tell
-    delay 0.3
-    '''
-    success, _ = run_applescript(script)
+end tell
+''')
+
+
+def click_export_button() -> bool:
+    """Click the Export button of the already-open Export Audio/Video dialog."""
+    success, _ = _CLICK_EXPORT_BUTTON_SCRIPT.run()
     return success
 
 
+def close_dialog_with_escape() -> bool:
+    """Close any open dialog with Escape key."""
+    _post_key(KEY_CODE_ESCAPE)
+    time.sleep(0.3)
+    return True
+
+
 def press_enter() -> bool:
     """Press Enter to confirm dialog."""
-    script = '''
-    tell application "System Events"
-        keystroke return
-    end tell
-    '''
-    success, _ = run_applescript(script)
-    return success
+    _post_key(KEY_CODE_RETURN)
+    return True
 
 
 def press_tab(count: int = 1) -> bool:
     """Press Tab key to navigate dialog."""
-    script = f'''
-    tell application "System Events"
-        repeat {count} times
-            keystroke tab
-            delay 0.1
-        end repeat
-    end tell
-    '''
-    success, _ = run_applescript(script)
-    return success
+    for _ in range(count):
+        _post_key(KEY_CODE_TAB)
+        time.sleep(KEY_REPEAT_DELAY)
+    return True
 
 
 def press_down_arrow(count: int = 1) -> bool:
     """Press Down arrow key."""
-    script = f'''
-    tell application "System Events"
-        repeat {count} times
-            key code 125
-            delay 0.1
-        end repeat
-    end tell
-    '''
-    success, _ = run_applescript(script)
-    return success
+    for _ in range(count):
+        _post_key(KEY_CODE_DOWN_ARROW)
+        time.sleep(KEY_REPEAT_DELAY)
+    return True
 
 
 def press_space() -> bool:
     """Press Space to toggle checkbox or activate button."""
-    script = '''
+    _post_key(KEY_CODE_SPACE)
+    return True
+
+
+# argv: text to type, passed as an argument so it needs no escaping
+_TYPE_TEXT_SCRIPT = CompiledScript('''
+on run argv
     tell application "System Events"
-        keystroke space
+        keystroke (item 1 of argv)
     end tell
-    '''
-    success, _ = run_applescript(script)
-    return success
+end run
+''')
 
 
 def type_text(text: str) -> bool:
     """Type text into the focused field."""
-    # Escape special characters for AppleScript
-    escaped = text.replace("\\", "\\\\").replace('"', '\\"')
-    script = f'''
-    tell application "System Events"
-        keystroke "{escaped}"
-    end tell
-    '''
-    success, _ = run_applescript(script)
+    success, _ = _TYPE_TEXT_SCRIPT.run(text)
     return success
 
 
@@ -231,6 +536,23 @@ def select_all_and_delete() -> bool:
     )
 
 
+_SELECT_TEXT_IN_FIELD_SCRIPT = CompiledScript('''
+tell application "System Events"
+    tell process "Live"
+        -- Use Cmd+A only if we're in a Save dialog window
+        set frontWindow to name of front window
+        if frontWindow is "Save" or frontWindow contains "Export" then
+            keystroke "a" using {command down}
+            delay 0.1
+        else
+            -- SAFETY: Not in a dialog, do NOT use Cmd+A
+            error "Not in a safe dialog window - aborting to prevent track deletion"
+        end if
+    end tell
+end tell
+''')
+
+
 def select_text_in_field() -> bool:
     """
     Safely select text in a text field, only if we're in a safe dialog.
@@ -238,25 +560,20 @@ def select_text_in_field() -> bool:
     Verifies we're in a Save/Export dialog before using Cmd+A.
     Aborts with error if not in a safe context.
     """
-    script = '''
-    tell application "System Events"
-        tell process "Live"
-            -- Use Cmd+A only if we're in a Save dialog window
-            set frontWindow to name of front window
-            if frontWindow is "Save" or frontWindow contains "Export" then
-                keystroke "a" using {command down}
-                delay 0.1
-            else
-                -- SAFETY: Not in a dialog, do NOT use Cmd+A
-                error "Not in a safe dialog window - aborting to prevent track deletion"
-            end if
-        end tell
-    end tell
-    '''
-    success, _ = run_applescript(script)
+    success, _ = _SELECT_TEXT_IN_FIELD_SCRIPT.run()
     return success
 
 
+_FRONT_WINDOW_SCRIPT = CompiledScript('''
+tell application "System Events"
+    tell process "Live"
+        set frontWindow to name of front window
+        return frontWindow
+    end tell
+end tell
+''')
+
+
 def verify_in_dialog() -> tuple[bool, str]:
     """
     Verify we're in a dialog window before performing potentially dangerous operations.
@@ -264,44 +581,97 @@ def verify_in_dialog() -> tuple[bool, str]:
     Returns:
         (is_safe, window_name) - True if in a safe dialog, False otherwise
     """
-    script = '''
-    tell application "System Events"
-        tell process "Live"
-            set frontWindow to name of front window
-            return frontWindow
-        end tell
-    end tell
-    '''
-    success, window_name = run_applescript(script)
+    success, window_name = _FRONT_WINDOW_SCRIPT.run()
 
     is_safe = any(safe in window_name for safe in SAFE_DIALOG_WINDOWS)
 
     return is_safe, window_name
 
 
-def set_file_save_location(path: Path) -> bool:
-    """
-    In a save dialog, navigate to the specified folder.
-
-    Uses Cmd+Shift+G to open "Go to folder" dialog.
-    """
-    script = f'''
+# One export from activating Live to saving; argv: output folder, filename.
+# The export dialog is accepted with its current settings, then the Save
+# dialog is pointed at the folder and given the filename. The script errors
+# out, without typing anything, if Live or the expected dialog isn't in front.
+# Returns "saved", or "exporting" when Live 12 renders straight away without
+# a Save dialog. The folder and filename are pasted, and the clipboard
+# restored afterwards.
+_EXPORT_FLOW_SCRIPT = CompiledScript(f'''
+on run argv
+    set outputFolder to item 1 of argv
+    set fileName to item 2 of argv
+    set savedClipboard to missing value
+    try
+        set savedClipboard to the clipboard
+    end try
+    try
+        set flowResult to exportWithNames(outputFolder, fileName)
+    on error errorMessage
+        if savedClipboard is not missing value then set the clipboard to savedClipboard
+        error errorMessage
+    end try
+    if savedClipboard is not missing value then set the clipboard to savedClipboard
+    return flowResult
+end run
+
+on exportWithNames(outputFolder, fileName)
+    tell application "Ableton Live 12 Suite" to activate
     tell application "System Events"
-        -- Open Go to Folder dialog
-        keystroke "g" using {{shift down, command down}}
-        delay 0.5
+        -- The shortcut must not go to whichever app was in front before
+        repeat 100 times
+            if frontmost of process "Live" then exit repeat
+            delay 0.02
+        end repeat
+        if not (frontmost of process "Live") then
+            error "Live did not come to the front"
+        end if
 
-        -- Type the path
-        keystroke "{path}"
-        delay 0.3
+        tell process "Live"
+            keystroke "r" using {{shift down, command down}}
+            repeat 100 times
+                if name of front window contains "{EXPORT_DIALOG_PREFIX}" then exit repeat
+                delay 0.05
+            end repeat
+            if name of front window does not contain "{EXPORT_DIALOG_PREFIX}" then
+                error "Export dialog did not appear"
+            end if
 
-        -- Press Enter to go to folder
-        keystroke return
-        delay 0.5
+            -- Accept the export settings; a Save dialog may follow, or
+            -- Live 12 may start rendering straight away
+            keystroke return
+            repeat 200 times
+                set windowName to name of front window
+                if windowName is "{SAVE_DIALOG_NAME}" then exit repeat
+                if windowName does not contain "{EXPORT_DIALOG_PREFIX}" then return "exporting"
+                delay 0.05
+            end repeat
+            if name of front window is not "{SAVE_DIALOG_NAME}" then
+                error "Save dialog did not appear"
+            end if
+
+            -- Go to the output folder
+            keystroke "g" using {{shift down, command down}}
+            delay 0.5
+            set the clipboard to outputFolder
+            keystroke "v" using {{command down}}
+            delay 0.3
+            keystroke return
+            delay 0.5
+
+            -- Replace the filename, only while still in the Save dialog
+            if name of front window is not "{SAVE_DIALOG_NAME}" then
+                error "Not in Save dialog - aborting for safety"
+            end if
+            keystroke "a" using {{command down}}
+            delay 0.1
+            set the clipboard to fileName
+            keystroke "v" using {{command down}}
+            delay 0.3
+            keystroke return
+        end tell
     end tell
-    '''
-    success, _ = run_applescript(script)
-    return success
+    return "saved"
+end exportWithNames
+''')
 
 
 class AbletonExportAutomation:
@@ -316,6 +686,9 @@ class AbletonExportAutomation:
         if platform.system() != "Darwin":
             raise RuntimeError("This automation only works on macOS")
 
+        # Compile while the caller is still setting up, not on the first export
+        _EXPORT_FLOW_SCRIPT.prepare()
+
     def export_track(
         self,
         track_name: str,
@@ -335,7 +708,8 @@ class AbletonExportAutomation:
             export_timeout: Max seconds to wait for export
 
         Returns:
-            True if export was triggered successfully
+            True if export was triggered successfully and, when waiting, the
+            exported file was written
         """
         if filename is None:
             # Sanitize track name for filename
@@ -343,76 +717,51 @@ class AbletonExportAutomation:
 
         print(f"  Exporting: {track_name} -> {filename}.wav")
 
-        # Activate Ableton
-        if not activate_ableton():
-            print("    ERROR: Could not activate Ableton Live")
-            return False
-
-        time.sleep(0.3)
-
-        # Open export dialog
-        if not open_export_dialog():
-            print("    ERROR: Could not open export dialog")
-            return False
-
-        time.sleep(1.5)
-
-        # The export dialog should now be open
-        # We need to:
-        # 1. Ensure "Selected Tracks Only" is chosen (may need Tab navigation)
-        # 2. Press Export button
-        # 3. Handle the file save dialog
-
-        # For now, just press Enter to accept defaults
-        # This assumes the user has configured their export settings
-        if not press_enter():
-            print("    ERROR: Could not press Enter")
+        # Activate, open the dialog, accept it and fill in the Save dialog in
+        # one osascript run, with the window checks done inside the script
+        output_path = self.output_folder / f"{filename}.wav"
+        try:
+            before = output_path.stat()
+        except OSError:
+            before = None
+        success, output = _EXPORT_FLOW_SCRIPT.run(str(self.output_folder), filename)
+        if not success:
+            print(f"    ERROR: Export automation failed: {output or 'unknown error'}")
+            _abort_and_escape()
             return False
-
-        time.sleep(0.5)
-
-        # File save dialog should appear
-        # Navigate to output folder and set filename
-        if not self._handle_save_dialog(filename):
-            print("    WARNING: Could not set save location, using default")
-
-        # Press Enter to save
-        time.sleep(0.3)
-        press_enter()
+        if output == "exporting":
+            # No Save dialog: Live is already rendering, so don't Escape it
+            print("    Export started without a Save dialog")
+            if wait_for_completion:
+                # Nothing was typed, so Live writes to its own default path
+                # rather than output_path; watch the window instead
+                try:
+                    _wait_for_export_completion_live12(max_wait=int(export_timeout))
+                except ExportError as e:
+                    print(f"    ERROR: {e}")
+                    return False
+            return True
 
         if wait_for_completion:
-            # Wait for export to complete
-            # The dialog closes when done, but we can't easily detect this
-            # For now, just wait a reasonable time based on expected length
+            # The export is done once Live has written the file and stopped
+            # growing it
             print(f"    Waiting for export (max {export_timeout}s)...")
-            time.sleep(min(export_timeout, 10))  # Simple wait for now
-
-        return True
-
-    def _handle_save_dialog(self, filename: str) -> bool:
-        """Handle the file save dialog."""
-        time.sleep(0.5)
-
-        # Go to output folder
-        set_file_save_location(self.output_folder)
-        time.sleep(0.5)
-
-        # Use safe filename typing (verifies we're in Save dialog)
-        _type_filename_in_save_dialog(filename)
+            if not wait_for_file_stable(output_path, export_timeout, before=before):
+                print(f"    ERROR: {output_path.name} was not written within {export_timeout}s")
+                return False
 
         return True
 
     def _sanitize_filename(self, name: str) -> str:
         """Sanitize a string for use as filename."""
-        # Remove/replace invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        result = name
-        for char in invalid_chars:
-            result = result.replace(char, "_")
-        return result.strip()
+        return name.translate(_FILENAME_TRANS).strip()
 
 
-def set_export_render_range(start_bar: int, length_bars: int) -> tuple[bool, str]:
+def set_export_render_range(
+    start_bar: int,
+    length_bars: int,
+    verified_window: Optional[str] = None,
+) -> tuple[bool, str]:
     """
     Set the Render Start and Render Length in the Export dialog.
 
@@ -423,12 +772,17 @@ def set_export_render_range(start_bar: int, length_bars: int) -> tuple[bool, str
     Args:
         start_bar: Bar number to start rendering (1-indexed, e.g., 1 for beginning)
         length_bars: Number of bars to render
+        verified_window: Front window name the caller has just checked
+            (skips re-querying it)
 
     Returns:
         (success, message) tuple
     """
     # Verify we're in the Export dialog
-    is_safe, window_name = verify_in_dialog()
+    if verified_window is None:
+        _, window_name = verify_in_dialog()
+    else:
+        window_name = verified_window
     if EXPORT_DIALOG_PREFIX not in window_name:
         return False, f"Not in Export dialog (found: {window_name})"
 
@@ -436,6 +790,47 @@ def set_export_render_range(start_bar: int, length_bars: int) -> tuple[bool, str
     return _set_render_range_via_clicks(start_bar, length_bars)
 
 
+# "x,y,width,height" of the Render Length field (slider 4) in the Export dialog
+_RENDER_LENGTH_BOUNDS_SCRIPT = CompiledScript('''
+tell application "System Events"
+    tell process "Live"
+        tell front window
+            tell group 1
+                set p to position of slider 4
+                set s to size of slider 4
+                set result to ((item 1 of p) as string) & "," & ((item 2 of p) as string)
+                set result to result & "," & ((item 1 of s) as string) & "," & ((item 2 of s) as string)
+                return result
+            end tell
+        end tell
+    end tell
+end tell
+''')
+
+# Replaces the contents of the Render Length field once it has been clicked
+# into, commits it with Tab (NOT Return, which triggers Export) and reads the
+# value back, all in one run. argv: length in bars
+_ENTER_RENDER_LENGTH_SCRIPT = CompiledScript('''
+on run argv
+    tell application "System Events"
+        keystroke "a" using command down
+        delay 0.2
+        keystroke (item 1 of argv)
+        delay 0.2
+        key code 48
+        delay 0.3
+        tell process "Live"
+            tell front window
+                tell group 1
+                    return (value of slider 4) as string
+                end tell
+            end tell
+        end tell
+    end tell
+end run
+''')
+
+
 def _set_render_range_via_clicks(start_bar: int, length_bars: int) -> tuple[bool, str]:
     """
     Set render range using click and type approach.
@@ -462,23 +857,8 @@ def _set_render_range_via_clicks(start_bar: int, length_bars: int) -> tuple[bool
             time.sleep(0.02)
         time.sleep(0.1)
 
-    # Get slider 4 position (Render Length bar) - using cleaner AppleScript
-    script = '''
-    tell application "System Events"
-        tell process "Live"
-            tell front window
-                tell group 1
-                    set p to position of slider 4
-                    set s to size of slider 4
-                    set result to ((item 1 of p) as string) & "," & ((item 2 of p) as string)
-                    set result to result & "," & ((item 1 of s) as string) & "," & ((item 2 of s) as string)
-                    return result
-                end tell
-            end tell
-        end tell
-    end tell
-    '''
-    _, result = run_applescript(script)
+    # Get slider 4 position (Render Length bar)
+    _, result = _RENDER_LENGTH_BOUNDS_SCRIPT.run()
 
     # Parse slider position from result; fall back to defaults on failure
     render_length_x, render_length_y = 1032, 334  # Default positions
@@ -499,37 +879,8 @@ def _set_render_range_via_clicks(start_bar: int, length_bars: int) -> tuple[bool
     triple_click(render_length_x, render_length_y)
     time.sleep(0.3)
 
-    # Step 2: Cmd+A to select all content in the field
-    select_all_script = '''
-    tell application "System Events"
-        keystroke "a" using command down
-    end tell
-    '''
-    run_applescript(select_all_script)
-    time.sleep(0.2)
-
-    # Step 3: Type the new value
-    type_text(str(length_bars))
-    time.sleep(0.2)
-
-    # Step 4: Press Tab to CONFIRM the value (NOT Return - Return triggers Export!)
-    press_tab()
-    time.sleep(0.3)  # Wait for UI to commit the value
-
-    # Verify the value was set correctly
-    verify_script = '''
-    tell application "System Events"
-        tell process "Live"
-            tell front window
-                tell group 1
-                    set s4 to value of slider 4
-                    return (s4 as string)
-                end tell
-            end tell
-        end tell
-    end tell
-    '''
-    _, result = run_applescript(verify_script)
+    # Step 2-4: Cmd+A, type the new value, Tab to confirm it and read it back
+    _, result = _ENTER_RENDER_LENGTH_SCRIPT.run(str(length_bars))
 
     # Verify the value was set correctly
     if result:
@@ -552,8 +903,7 @@ def trigger_export_simple() -> bool:
     For testing purposes.
     """
     activate_ableton()
-    time.sleep(0.5)
-    open_export_dialog()
+    open_export_dialog(activate=False)
     time.sleep(2)
     press_enter()
     return True
@@ -570,14 +920,11 @@ def _activate_and_verify(max_retries: int = 5) -> None:
     is unlocked with an active display for reliable automation.
     """
     for attempt in range(max_retries):
-        if not activate_ableton():
-            raise AbletonActivationError("Failed to activate Ableton Live")
-        time.sleep(0.8)
-
-        is_frontmost, app_name = _check_frontmost_app()
-        if is_frontmost:
+        # activate_ableton waits for Live to come to the front itself
+        if activate_ableton():
             return  # Success
 
+        _, app_name = _check_frontmost_app()
         if attempt < max_retries - 1:
             print(f"  Retry {attempt + 1}: Ableton not frontmost (found: {app_name}), retrying...")
             time.sleep(0.5)
@@ -586,16 +933,22 @@ def _activate_and_verify(max_retries: int = 5) -> None:
     print(f"  Warning: Proceeding despite {app_name} being frontmost - dialog verification will catch errors")
 
 
-def _open_and_verify_export_dialog() -> None:
-    """Open export dialog and verify it appeared. Raises on failure."""
-    if not open_export_dialog():
+def _open_and_verify_export_dialog() -> str:
+    """
+    Open export dialog and verify it appeared. Raises on failure.
+
+    Returns:
+        The Export dialog's window name
+    """
+    # _activate_and_verify has already brought Live to the front
+    if not open_export_dialog(activate=False):
         raise DialogVerificationError("Failed to open export dialog")
-    time.sleep(1.5)
 
-    _, window_name = verify_in_dialog()
-    if EXPORT_DIALOG_PREFIX not in window_name:
+    found, window_name = wait_for_dialog(EXPORT_DIALOG_PREFIX)
+    if not found:
         _abort_and_escape()
         raise DialogVerificationError(f"Expected Export dialog, found: '{window_name}'")
+    return window_name
 
 
 def _click_export_and_verify_save_dialog() -> None:
@@ -617,28 +970,161 @@ def _click_export_and_verify_save_dialog() -> None:
         raise DialogVerificationError(f"Expected Save dialog, found: '{window_name}'")
 
 
-def _wait_for_export_completion(max_wait: int = 120) -> None:
-    """Wait for export to complete. Raises on timeout."""
+# Polls the front window inside one osascript run until its name contains
+# none of the given markers or the time runs out, then returns the name.
+# argv: max wait in seconds, then the markers.
+_WAIT_WHILE_WINDOW_SCRIPT = CompiledScript('''
+on run argv
+    set maxWait to (item 1 of argv) as real
+    set markers to rest of argv
+    set waited to 0
+    tell application "System Events"
+        tell process "Live"
+            repeat
+                set windowName to ""
+                try
+                    set windowName to name of front window
+                end try
+                set stillOpen to false
+                repeat with marker in markers
+                    if windowName contains (contents of marker) then set stillOpen to true
+                end repeat
+                if not stillOpen or waited >= maxWait then return windowName
+                delay 0.25
+                set waited to waited + 0.25
+            end repeat
+        end tell
+    end tell
+end run
+''')
+
+
+def _wait_while_window_contains(
+    markers: tuple[str, ...], max_wait: int, progress_every: int = 10
+) -> str:
+    """
+    Wait for the front window to stop matching any of markers.
+
+    The polling happens inside osascript, one run per progress_every
+    seconds rather than one spawn per check, with a progress line printed
+    between runs.
+
+    Returns:
+        The front window name when the wait ended
+    """
     waited = 0
-    while waited < max_wait:
-        time.sleep(1.0)
-        waited += 1
-        _, window_name = verify_in_dialog()
+    while True:
+        chunk = min(progress_every, max_wait - waited)
+        success, window_name = _WAIT_WHILE_WINDOW_SCRIPT.run(
+            str(chunk), *markers, timeout=chunk + 10
+        )
+        if not success:
+            _, window_name = verify_in_dialog()
+        waited += chunk
+
+        if waited >= max_wait or not any(marker in window_name for marker in markers):
+            return window_name
+        print(f"  Exporting... {waited}s")
 
-        if SAVE_DIALOG_NAME in window_name:
-            raise ExportError(f"Save dialog still open after {waited}s - export may have failed")
 
-        if EXPORT_DIALOG_PREFIX not in window_name:
-            return  # Export complete
+def _wait_for_export_completion(max_wait: int = 120) -> None:
+    """Wait for export to complete. Raises on timeout."""
+    # Return has only just been pressed in the Save dialog, so it counts as
+    # still exporting until it closes
+    window_name = _wait_while_window_contains(
+        (EXPORT_DIALOG_PREFIX, SAVE_DIALOG_NAME), max_wait
+    )
 
-        if waited % 10 == 0:
-            print(f"  Exporting... {waited}s")
+    if SAVE_DIALOG_NAME in window_name:
+        raise ExportError(f"Save dialog still open after {max_wait}s - export may have failed")
 
-    _, window_name = verify_in_dialog()
-    if SAVE_DIALOG_NAME in window_name or EXPORT_DIALOG_PREFIX in window_name:
+    if EXPORT_DIALOG_PREFIX in window_name:
         raise ExportError(f"Export timed out after {max_wait}s - dialog: '{window_name}'")
 
 
+# Steps 5-9 of safe_export_with_filename in one run: Enter in the Export
+# dialog, wait for the window to change, and if a Save dialog follows, go to
+# the folder (if any), paste the filename and save. Every key is guarded by a
+# window check in the same script. argv: output folder or "", filename.
+# Returns "saved", "exporting" (Live 12 exports without a Save dialog),
+# "export_dialog" (still in the Export dialog) or "fail:<expected>:<window>".
+_DIALOG_FLOW_SCRIPT = CompiledScript(f'''
+on run argv
+    set savedClipboard to missing value
+    try
+        set savedClipboard to the clipboard
+    end try
+    try
+        set flowResult to saveThroughDialogs(item 1 of argv, item 2 of argv)
+    on error errorMessage
+        if savedClipboard is not missing value then set the clipboard to savedClipboard
+        error errorMessage
+    end try
+    if savedClipboard is not missing value then set the clipboard to savedClipboard
+    return flowResult
+end run
+
+on frontWindowName()
+    tell application "System Events"
+        try
+            return name of front window of process "Live"
+        end try
+    end tell
+    return ""
+end frontWindowName
+
+on saveThroughDialogs(outputFolder, fileName)
+    set initialWindow to frontWindowName()
+    if initialWindow does not contain "{EXPORT_DIALOG_PREFIX}" then
+        return "fail:{EXPORT_DIALOG_PREFIX}:" & initialWindow
+    end if
+    tell application "System Events" to keystroke return
+
+    -- Wait up to 10s for the window to change
+    set windowName to initialWindow
+    repeat 200 times
+        set windowName to frontWindowName()
+        if windowName is not initialWindow then exit repeat
+        delay 0.05
+    end repeat
+
+    if windowName does not contain "{SAVE_DIALOG_NAME}" then
+        if windowName contains "{EXPORT_DIALOG_PREFIX}" then return "export_dialog"
+        return "exporting"
+    end if
+
+    tell application "System Events"
+        if outputFolder is not "" then
+            keystroke "g" using {{shift down, command down}}
+            delay 0.5
+            set the clipboard to outputFolder
+            keystroke "v" using {{command down}}
+            delay 0.3
+            keystroke return
+            delay 0.5
+        end if
+
+        set windowName to my frontWindowName()
+        if windowName does not contain "{SAVE_DIALOG_NAME}" then
+            return "fail:{SAVE_DIALOG_NAME}:" & windowName
+        end if
+        keystroke "a" using {{command down}}
+        delay 0.1
+        set the clipboard to fileName
+        keystroke "v" using {{command down}}
+        delay 0.3
+
+        set windowName to my frontWindowName()
+        if windowName does not contain "{SAVE_DIALOG_NAME}" then
+            return "fail:{SAVE_DIALOG_NAME}:" & windowName
+        end if
+        keystroke return
+    end tell
+    return "saved"
+end saveThroughDialogs
+''')
+
+
 def safe_export_with_filename(filename: str, output_folder: Optional[str] = None) -> tuple[bool, str]:
     """
     Safely export with full verification at each step.
@@ -660,30 +1146,20 @@ def safe_export_with_filename(filename: str, output_folder: Optional[str] = None
         # Step 3-4: Open export dialog and verify
         _open_and_verify_export_dialog()
 
-        # Step 5-6: Click Export and poll until window changes
-        _, initial_window = verify_in_dialog()
-        press_enter()
-
-        # Poll for window change instead of fixed sleep (promise-like waiting)
-        try:
-            window_name = wait_for_window_change(initial_window, timeout=10.0)
-        except TimeoutError:
-            # Window didn't change - may already be exporting
-            _, window_name = verify_in_dialog()
+        # Step 5-9: Click Export, then fill in and confirm the Save dialog if
+        # one appears, with the window checks done inside the script
+        success, status = _DIALOG_FLOW_SCRIPT.run(output_folder or "", filename)
+        if not success:
+            raise ExportError(f"Export dialog automation failed: {status or 'unknown error'}")
+        if status.startswith("fail:"):
+            _, expected, window_name = status.split(":", 2)
+            raise DialogVerificationError(f"Expected {expected} dialog, found: '{window_name}'")
 
         # Ableton Live 12 may show Save dialog OR export directly
-        if SAVE_DIALOG_NAME in window_name:
-            # Traditional workflow with Save dialog
-            if output_folder:
-                set_file_save_location(Path(output_folder))
-                time.sleep(0.5)
-
-            _type_filename_in_save_dialog(filename)
-            time.sleep(0.3)
-            press_enter()
+        if status == "saved":
             _wait_for_export_completion()
 
-        elif EXPORT_DIALOG_PREFIX not in window_name:
+        elif status == "exporting":
             # Export started directly (no Save dialog in Live 12)
             # Just wait for export to complete
             _wait_for_export_completion_live12(max_wait=120)
@@ -705,42 +1181,45 @@ def safe_export_with_filename(filename: str, output_folder: Optional[str] = None
         return False, f"OS error: {e}"
 
 
-def _handle_export_confirmation_and_wait() -> None:
-    """Handle any confirmation dialog and wait for export completion."""
-    # Check for "stop audio" confirmation
-    script = '''
-    tell application "System Events"
-        tell process "Live"
-            tell front window
-                tell group 1
-                    try
-                        set firstText to value of static text 1
-                        if firstText contains "stop audio" then
-                            return "confirmation"
-                        end if
-                    end try
-                    return "no_confirmation"
-                end tell
+_CHECK_CONFIRMATION_SCRIPT = CompiledScript('''
+tell application "System Events"
+    tell process "Live"
+        tell front window
+            tell group 1
+                try
+                    set firstText to value of static text 1
+                    if firstText contains "stop audio" then
+                        return "confirmation"
+                    end if
+                end try
+                return "no_confirmation"
             end tell
         end tell
     end tell
-    '''
-    success, result = run_applescript(script)
+end tell
+''')
+
+_CLICK_PROCEED_SCRIPT = CompiledScript('''
+tell application "System Events"
+    tell process "Live"
+        tell front window
+            tell group 1
+                click button 2
+            end tell
+        end tell
+    end tell
+end tell
+''')
+
+
+def _handle_export_confirmation_and_wait() -> None:
+    """Handle any confirmation dialog and wait for export completion."""
+    # Check for "stop audio" confirmation
+    success, result = _CHECK_CONFIRMATION_SCRIPT.run()
 
     if success and "confirmation" in result:
         # Click Proceed button (button 2)
-        script = '''
-        tell application "System Events"
-            tell process "Live"
-                tell front window
-                    tell group 1
-                        click button 2
-                    end tell
-                end tell
-            end tell
-        end tell
-        '''
-        run_applescript(script)
+        _CLICK_PROCEED_SCRIPT.run()
         time.sleep(1.0)
 
     # Now wait for export to complete
@@ -749,64 +1228,37 @@ def _handle_export_confirmation_and_wait() -> None:
 
 def _wait_for_export_completion_live12(max_wait: int = 120) -> None:
     """Wait for export completion in Live 12 (no Save dialog workflow)."""
-    waited = 0
-    while waited < max_wait:
-        time.sleep(1.0)
-        waited += 1
-
-        _, window_name = verify_in_dialog()
+    window_name = _wait_while_window_contains(
+        (EXPORT_DIALOG_PREFIX, SAVE_DIALOG_NAME), max_wait
+    )
 
-        # If we're back to the main project window, export is complete
-        if EXPORT_DIALOG_PREFIX not in window_name and SAVE_DIALOG_NAME not in window_name:
-            return  # Export complete
+    # Back to the main project window means the export is complete
+    if EXPORT_DIALOG_PREFIX in window_name or SAVE_DIALOG_NAME in window_name:
+        raise ExportError(f"Export timed out after {max_wait}s")
 
-        if waited % 10 == 0:
-            print(f"  Exporting... {waited}s")
 
-    raise ExportError(f"Export timed out after {max_wait}s")
+# Asks Live's process directly first, since a "whose" query over every process
+# can be very slow. The name of whatever else is in front is only needed for
+# the retry message, so that query is left for the unusual case.
+_FRONTMOST_APP_SCRIPT = CompiledScript('''
+tell application "System Events"
+    if exists process "Live" then
+        if frontmost of process "Live" then return "Live"
+    end if
+    return name of first application process whose frontmost is true
+end tell
+''')
 
 
 def _check_frontmost_app() -> tuple[bool, str]:
     """Check if Ableton is the frontmost application."""
-    script = '''
-    tell application "System Events"
-        set frontApp to name of first application process whose frontmost is true
-        return frontApp
-    end tell
-    '''
-    success, app_name = run_applescript(script)
-    return app_name == "Live", app_name
+    _, app_name = _FRONTMOST_APP_SCRIPT.run()
+    return app_name == ABLETON_PROCESS_NAME, app_name
 
 
 def _abort_and_escape():
     """Abort current operation by pressing Escape multiple times."""
+    # Three Escapes close a Save dialog and the Export dialog behind it, plus
+    # any confirmation on top
     for _ in range(3):
         close_dialog_with_escape()
-        time.sleep(0.2)
-
-
-def _type_filename_in_save_dialog(filename: str) -> bool:
-    """
-    Type a filename in the Save dialog.
-
-    ONLY call this after verifying we're in a Save dialog!
-    Uses Cmd+A to select existing text, which is safe in a text field.
-    """
-    script = f'''
-    tell application "System Events"
-        tell process "Live"
-            -- Verify we're still in Save dialog
-            set frontWindow to name of front window
-            if frontWindow is not "Save" then
-                error "Not in Save dialog - aborting for safety"
-            end if
-
-            -- Select all text in filename field and replace
-            keystroke "a" using {{command down}}
-            delay 0.1
-            keystroke "{filename}"
-        end tell
-    end tell
-    '''
-    success, _ = run_applescript(script)
-    return success
@@ -4,24 +4,45 @@ Tests for gui_automation module.
 Tests the safety mechanisms and helper functions without requiring Ableton Live.
 """
 
+import os
 import subprocess
+import tempfile
+import threading
 import unittest
-from unittest.mock import patch, MagicMock
+from pathlib import Path
+from unittest.mock import patch, DEFAULT, MagicMock
 
+import gui_automation
 from gui_automation import (
     # Constants
     SAFE_DIALOG_WINDOWS,
     EXPORT_DIALOG_PREFIX,
     SAVE_DIALOG_NAME,
     INVALID_FILENAME_CHARS,
+    KEY_CODE_R,
+    KEY_CODE_TAB,
     # Exceptions
     ExportError,
     DialogVerificationError,
     AbletonActivationError,
     # Functions
     run_applescript,
+    CompiledScript,
     verify_in_dialog,
+    wait_for_dialog,
+    wait_for_file_stable,
+    safe_export_with_filename,
+    press_tab,
+    activate_ableton,
+    open_export_dialog,
+    set_export_render_range,
     select_all_and_delete,
+    AbletonExportAutomation,
+    _ACTIVATE_SCRIPT,
+    _EXPORT_FLOW_SCRIPT,
+    _set_render_range_via_clicks,
+    _wait_for_export_completion,
+    _wait_for_export_completion_live12,
 )
 
 
@@ -74,6 +95,7 @@ class TestExceptionHierarchy(unittest.TestCase):
                 raise exc_class("test message")
 
 
+@patch("gui_automation.NSAppleScript", None)
 class TestRunApplescript(unittest.TestCase):
     """Test AppleScript execution wrapper."""
 
@@ -117,10 +139,132 @@ class TestRunApplescript(unittest.TestCase):
         self.assertIn("OS error", output)
 
 
+@patch("gui_automation.NSAppleScript", None)
+class TestCompiledScript(unittest.TestCase):
+    """Test compile-once AppleScript execution."""
+
+    @patch("gui_automation.atexit.register")
+    @patch("gui_automation.subprocess.run")
+    def test_compiles_once_and_runs_compiled_file(self, mock_run: MagicMock, mock_register: MagicMock) -> None:
+        """The script should be compiled on first run only."""
+        mock_run.return_value = MagicMock(returncode=0, stdout="done\n")
+        script = CompiledScript("return \"done\"")
+
+        self.assertEqual(script.run(), (True, "done"))
+        self.assertEqual(script.run(), (True, "done"))
+
+        commands = [c.args[0] for c in mock_run.call_args_list]
+        self.assertEqual([cmd[0] for cmd in commands], ["osacompile", "osascript", "osascript"])
+        compiled_path = commands[0][2]
+        self.assertEqual(commands[1], ["osascript", compiled_path])
+        mock_register.assert_called_once()
+        os.unlink(compiled_path)
+
+    @patch("gui_automation.atexit.register")
+    @patch("gui_automation.subprocess.run")
+    def test_prepare_compiles_without_running(self, mock_run: MagicMock, mock_register: MagicMock) -> None:
+        """prepare() should compile ahead of time, and run() then reuse it."""
+        mock_run.return_value = MagicMock(returncode=0, stdout="done\n")
+        script = CompiledScript("return \"done\"")
+
+        script.prepare()
+        self.assertEqual([c.args[0][0] for c in mock_run.call_args_list], ["osacompile"])
+
+        script.run()
+        self.assertEqual([c.args[0][0] for c in mock_run.call_args_list], ["osacompile", "osascript"])
+        os.unlink(mock_run.call_args_list[0].args[0][2])
+
+    @patch("gui_automation.subprocess.run")
+    def test_falls_back_to_source_when_compile_fails(self, mock_run: MagicMock) -> None:
+        """A script that can't be compiled should still run from source."""
+        mock_run.side_effect = [
+            MagicMock(returncode=1, stdout=""),
+            MagicMock(returncode=0, stdout="ok\n"),
+            MagicMock(returncode=0, stdout="ok\n"),
+        ]
+        script = CompiledScript("return \"ok\"")
+
+        self.assertEqual(script.run(), (True, "ok"))
+        self.assertEqual(script.run(), (True, "ok"))
+
+        commands = [c.args[0] for c in mock_run.call_args_list]
+        self.assertEqual(commands[0][0], "osacompile")
+        self.assertFalse(os.path.exists(commands[0][2]))
+        self.assertEqual(commands[1], ["osascript", "-e", "return \"ok\""])
+        self.assertEqual(commands[2], commands[1])
+
+
+class TestRunInProcess(unittest.TestCase):
+    """Test running AppleScript through NSAppleScript."""
+
+    def setUp(self) -> None:
+        self.script = MagicMock()
+        self.script.compileAndReturnError_.return_value = (True, None)
+        ns_applescript = MagicMock()
+        ns_applescript.alloc.return_value.initWithSource_.return_value = self.script
+        patcher = patch.multiple(
+            "gui_automation",
+            NSAppleScript=ns_applescript,
+            NSAppleEventDescriptor=MagicMock(),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("gui_automation.subprocess.run")
+    def test_runs_without_osascript(self, mock_run: MagicMock) -> None:
+        """A script with no arguments should execute in-process."""
+        result = MagicMock()
+        result.descriptorType.return_value = 0
+        result.stringValue.return_value = "Live"
+        self.script.executeAndReturnError_.return_value = (result, None)
+
+        self.assertEqual(run_applescript("return 1"), (True, "Live"))
+        mock_run.assert_not_called()
+
+    @patch("gui_automation.subprocess.run")
+    def test_passes_args_as_run_event(self, mock_run: MagicMock) -> None:
+        """Arguments should go through a run event, and errors be reported."""
+        error = {"NSAppleScriptErrorMessage": "Not in Save dialog"}
+        self.script.executeAppleEvent_error_.return_value = (None, error)
+
+        self.assertEqual(
+            CompiledScript("on run argv\nend run").run("Lead"),
+            (False, "Not in Save dialog"),
+        )
+        self.script.executeAppleEvent_error_.assert_called_once()
+        mock_run.assert_not_called()
+
+
+    def test_compiled_script_keeps_its_own_compilation(self) -> None:
+        """A CompiledScript should compile once; ad-hoc sources aren't kept."""
+        self.script.executeAndReturnError_.return_value = (None, None)
+        script = CompiledScript("return 1")
+        script.run()
+        script.run()
+        run_applescript("return 2")
+        run_applescript("return 2")
+
+        init = gui_automation.NSAppleScript.alloc.return_value.initWithSource_
+        sources = [c.args[0] for c in init.call_args_list]
+        self.assertEqual(sources, ["return 1", "return 2", "return 2"])
+
+    @patch("gui_automation.subprocess.run")
+    def test_worker_threads_use_osascript(self, mock_run: MagicMock) -> None:
+        """Off the main thread, NSAppleScript must not be touched."""
+        mock_run.return_value = MagicMock(returncode=0, stdout="ok\n")
+        results = []
+        worker = threading.Thread(target=lambda: results.append(run_applescript("return 1")))
+        worker.start()
+        worker.join()
+
+        self.assertEqual(results, [(True, "ok")])
+        gui_automation.NSAppleScript.alloc.assert_not_called()
+
+
 class TestVerifyInDialog(unittest.TestCase):
     """Test dialog verification function."""
 
-    @patch("gui_automation.run_applescript")
+    @patch("gui_automation.CompiledScript.run")
     def test_returns_safe_for_save_dialog(self, mock_run: MagicMock) -> None:
         """verify_in_dialog should return (True, 'Save') for Save dialog."""
         mock_run.return_value = (True, "Save")
@@ -128,21 +272,21 @@ class TestVerifyInDialog(unittest.TestCase):
         self.assertTrue(is_safe)
         self.assertEqual(window_name, "Save")
 
-    @patch("gui_automation.run_applescript")
+    @patch("gui_automation.CompiledScript.run")
     def test_returns_safe_for_export_dialog(self, mock_run: MagicMock) -> None:
         """verify_in_dialog should return True for Export dialogs."""
         mock_run.return_value = (True, "Export Audio/Video")
         is_safe, window_name = verify_in_dialog()
         self.assertTrue(is_safe)
 
-    @patch("gui_automation.run_applescript")
+    @patch("gui_automation.CompiledScript.run")
     def test_returns_unsafe_for_main_window(self, mock_run: MagicMock) -> None:
         """verify_in_dialog should return False for main arrangement window."""
         mock_run.return_value = (True, "")
         is_safe, window_name = verify_in_dialog()
         self.assertFalse(is_safe)
 
-    @patch("gui_automation.run_applescript")
+    @patch("gui_automation.CompiledScript.run")
     def test_returns_unsafe_for_browser_window(self, mock_run: MagicMock) -> None:
         """verify_in_dialog should return False for browser window."""
         mock_run.return_value = (True, "Browser")
@@ -150,6 +294,308 @@ class TestVerifyInDialog(unittest.TestCase):
         self.assertFalse(is_safe)
 
 
+class TestWaitForDialog(unittest.TestCase):
+    """Test polling for a dialog to appear."""
+
+    @patch("gui_automation.time.sleep")
+    @patch("gui_automation.verify_in_dialog")
+    def test_returns_once_dialog_appears(self, mock_verify: MagicMock, mock_sleep: MagicMock) -> None:
+        """wait_for_dialog should stop polling as soon as the dialog is front."""
+        mock_verify.side_effect = [(False, ""), (True, "Export Audio/Video")]
+        found, window_name = wait_for_dialog("Export", timeout=3.0)
+        self.assertTrue(found)
+        self.assertEqual(window_name, "Export Audio/Video")
+        self.assertEqual(mock_verify.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    @patch("gui_automation.time.sleep")
+    @patch("gui_automation.verify_in_dialog")
+    def test_returns_last_window_on_timeout(self, mock_verify: MagicMock, mock_sleep: MagicMock) -> None:
+        """wait_for_dialog should report the last window seen on timeout."""
+        mock_verify.return_value = (False, "Browser")
+        found, window_name = wait_for_dialog("Export", timeout=0.0)
+        self.assertFalse(found)
+        self.assertEqual(window_name, "Browser")
+        mock_sleep.assert_not_called()
+
+
+class TestWaitForExportCompletion(unittest.TestCase):
+    """Test waiting for an export to finish in a single osascript run."""
+
+    @patch("gui_automation.CompiledScript.run")
+    def test_polls_in_one_script_run(self, mock_run: MagicMock) -> None:
+        """A quick export should need one script run covering both dialogs."""
+        mock_run.return_value = (True, "My Set")
+        _wait_for_export_completion_live12(max_wait=120)
+        mock_run.assert_called_once_with("10", "Export", "Save", timeout=20)
+
+    @patch("builtins.print")
+    @patch("gui_automation.CompiledScript.run")
+    def test_reports_progress_between_runs(self, mock_run: MagicMock, mock_print: MagicMock) -> None:
+        """A long export should print progress every 10 seconds."""
+        mock_run.side_effect = [(True, "Export"), (True, "Export"), (True, "My Set")]
+        _wait_for_export_completion_live12(max_wait=120)
+        self.assertEqual(mock_run.call_count, 3)
+        mock_print.assert_any_call("  Exporting... 10s")
+        mock_print.assert_any_call("  Exporting... 20s")
+
+    @patch("gui_automation.CompiledScript.run")
+    def test_waits_for_save_dialog_to_close(self, mock_run: MagicMock) -> None:
+        """The Save dialog just after Return should be waited out, not fail."""
+        mock_run.side_effect = [(True, "Save"), (True, "My Set")]
+        _wait_for_export_completion(max_wait=120)
+        mock_run.assert_called_with("10", "Export", "Save", timeout=20)
+
+    @patch("builtins.print")
+    @patch("gui_automation.CompiledScript.run")
+    def test_raises_when_save_dialog_remains(self, mock_run: MagicMock, mock_print: MagicMock) -> None:
+        """A Save dialog still in front at the timeout is a failure."""
+        mock_run.return_value = (True, "Save")
+        with self.assertRaises(ExportError):
+            _wait_for_export_completion(max_wait=20)
+
+
+class TestWaitForFileStable(unittest.TestCase):
+    """Test detecting a finished export from the file it writes."""
+
+    def test_returns_once_file_is_written(self) -> None:
+        """A file that exists and stops growing should count as done."""
+        with tempfile.TemporaryDirectory() as folder:
+            path = Path(folder) / "Lead.wav"
+            path.write_bytes(b"RIFF")
+            self.assertTrue(wait_for_file_stable(path, timeout=1.0, quiet=0.02, interval=0.01))
+
+    def test_ignores_file_older_than_export(self) -> None:
+        """An existing file from an earlier export should not count."""
+        with tempfile.TemporaryDirectory() as folder:
+            path = Path(folder) / "Lead.wav"
+            path.write_bytes(b"RIFF")
+            before = path.stat()
+            self.assertFalse(wait_for_file_stable(
+                path, timeout=0.05, before=before, quiet=0.01, interval=0.01
+            ))
+
+    def test_detects_overwrite_within_same_mtime(self) -> None:
+        """A rewrite should count even when the mtime doesn't move."""
+        with tempfile.TemporaryDirectory() as folder:
+            path = Path(folder) / "Lead.wav"
+            path.write_bytes(b"RIFF")
+            before = path.stat()
+            path.write_bytes(b"RIFF" * 16)
+            os.utime(path, ns=(before.st_atime_ns, before.st_mtime_ns))
+            self.assertTrue(wait_for_file_stable(
+                path, timeout=1.0, before=before, quiet=0.02, interval=0.01
+            ))
+
+
+@patch("gui_automation.time.sleep")
+@patch.multiple(
+    "gui_automation",
+    CGEventCreateKeyboardEvent=DEFAULT,
+    CGEventPost=DEFAULT,
+    CGEventSetFlags=DEFAULT,
+    kCGEventFlagMaskCommand=0x100000,
+    kCGEventFlagMaskShift=0x20000,
+)
+class TestKeyPresses(unittest.TestCase):
+    """Test keys posted as Quartz events rather than through AppleScript."""
+
+    def test_press_tab_posts_down_and_up_per_press(self, mock_sleep: MagicMock, **mocks: MagicMock) -> None:
+        """Each press should be a key down followed by a key up."""
+        self.assertTrue(press_tab(2))
+        self.assertEqual(
+            [c.args for c in mocks["CGEventCreateKeyboardEvent"].call_args_list],
+            [(None, KEY_CODE_TAB, True), (None, KEY_CODE_TAB, False)] * 2,
+        )
+        self.assertEqual(mocks["CGEventPost"].call_count, 4)
+        mocks["CGEventSetFlags"].assert_not_called()
+
+    @patch("gui_automation.activate_ableton", return_value=True)
+    def test_open_export_dialog_sends_cmd_shift_r(
+        self, mock_activate: MagicMock, mock_sleep: MagicMock, **mocks: MagicMock
+    ) -> None:
+        """Cmd+Shift+R should carry both modifier flags."""
+        self.assertTrue(open_export_dialog())
+        mocks["CGEventCreateKeyboardEvent"].assert_any_call(None, KEY_CODE_R, True)
+        event = mocks["CGEventCreateKeyboardEvent"].return_value
+        mocks["CGEventSetFlags"].assert_called_with(event, 0x100000 | 0x20000)
+
+
+class TestActivateAbleton(unittest.TestCase):
+    """Test bringing Live to the foreground."""
+
+    @patch("gui_automation.CompiledScript.run")
+    def test_returns_once_live_is_frontmost(self, mock_run: MagicMock) -> None:
+        """Activation and the frontmost poll should be one script run."""
+        mock_run.return_value = (True, "true")
+        self.assertTrue(activate_ableton())
+        mock_run.assert_called_once_with("3.0", timeout=13.0)
+
+    @patch("gui_automation.CompiledScript.run")
+    def test_reports_failure_when_live_stays_behind(self, mock_run: MagicMock) -> None:
+        """Timing out with another app in front should not count as activated."""
+        mock_run.return_value = (True, "false")
+        self.assertFalse(activate_ableton())
+
+    def test_script_polls_system_events(self) -> None:
+        """Frontmost state should come from System Events, not NSWorkspace."""
+        self.assertIn('frontmost of process "Live"', _ACTIVATE_SCRIPT.source)
+
+
+@patch.multiple(
+    "gui_automation",
+    _activate_and_verify=DEFAULT,
+    open_export_dialog=DEFAULT,
+    wait_for_dialog=DEFAULT,
+    _wait_for_export_completion=DEFAULT,
+    _handle_export_confirmation_and_wait=DEFAULT,
+    _abort_and_escape=DEFAULT,
+    verify_in_dialog=DEFAULT,
+)
+class TestSafeExportWithFilename(unittest.TestCase):
+    """Test the step-by-step export flow."""
+
+    def _run_export(self, mocks: dict, status: str) -> tuple[bool, str]:
+        mocks["open_export_dialog"].return_value = True
+        mocks["wait_for_dialog"].return_value = (True, "Export Audio/Video")
+        with patch("gui_automation.CompiledScript.run", return_value=(True, status)) as mock_run:
+            result = safe_export_with_filename("Lead", output_folder="/tmp/Stems")
+        mock_run.assert_called_once_with("/tmp/Stems", "Lead")
+        return result
+
+    def test_save_dialog_flow_is_one_script(self, **mocks: MagicMock) -> None:
+        """Steps after opening the dialog should run as a single script."""
+        success, _ = self._run_export(mocks, "saved")
+        self.assertTrue(success)
+        mocks["_wait_for_export_completion"].assert_called_once()
+        mocks["verify_in_dialog"].assert_not_called()
+
+    def test_still_in_export_dialog_checks_confirmation(self, **mocks: MagicMock) -> None:
+        """Staying in the Export dialog should go to the confirmation check."""
+        success, _ = self._run_export(mocks, "export_dialog")
+        self.assertTrue(success)
+        mocks["_handle_export_confirmation_and_wait"].assert_called_once()
+
+    def test_failed_window_check_aborts(self, **mocks: MagicMock) -> None:
+        """A window check failing inside the script should abort the export."""
+        success, message = self._run_export(mocks, "fail:Save:Browser: Sounds")
+        self.assertFalse(success)
+        self.assertEqual(message, "Expected Save dialog, found: 'Browser: Sounds'")
+        mocks["_abort_and_escape"].assert_called_once()
+        mocks["_wait_for_export_completion"].assert_not_called()
+
+
+class TestSetExportRenderRange(unittest.TestCase):
+    """Test the Export dialog check before setting the render range."""
+
+    @patch("gui_automation._set_render_range_via_clicks")
+    @patch("gui_automation.verify_in_dialog")
+    def test_refuses_outside_export_dialog(self, mock_verify: MagicMock, mock_clicks: MagicMock) -> None:
+        """set_export_render_range should not click anything outside the dialog."""
+        mock_verify.return_value = (False, "Browser")
+        success, message = set_export_render_range(1, 8)
+        self.assertFalse(success)
+        self.assertIn("Browser", message)
+        mock_clicks.assert_not_called()
+
+    @patch("gui_automation._set_render_range_via_clicks")
+    @patch("gui_automation.verify_in_dialog")
+    def test_uses_verified_window(self, mock_verify: MagicMock, mock_clicks: MagicMock) -> None:
+        """A window name the caller already checked should not be queried again."""
+        mock_clicks.return_value = (True, "ok")
+        success, _ = set_export_render_range(1, 8, verified_window="Export Audio/Video")
+        self.assertTrue(success)
+        mock_verify.assert_not_called()
+        mock_clicks.assert_called_once_with(1, 8)
+
+
+@patch("gui_automation.time.sleep")
+@patch.multiple(
+    "gui_automation",
+    CGEventCreateMouseEvent=DEFAULT,
+    CGEventPost=DEFAULT,
+    CGEventSetIntegerValueField=DEFAULT,
+)
+class TestSetRenderRangeViaClicks(unittest.TestCase):
+    """Test entering the render length after clicking into the field."""
+
+    @patch("gui_automation.CompiledScript.run")
+    def test_enters_and_verifies_in_one_script(
+        self, mock_run: MagicMock, mock_sleep: MagicMock, **mocks: MagicMock
+    ) -> None:
+        """Select-all, typing, Tab and the read-back should be one script run."""
+        mock_run.side_effect = [(True, "1000,320,64,28"), (True, "8")]
+        success, message = _set_render_range_via_clicks(1, 8)
+        self.assertTrue(success)
+        self.assertIn("8 bars", message)
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(mock_run.call_args.args, ("8",))
+
+
+class TestAbletonExportAutomation(unittest.TestCase):
+    """Test the single-script export flow."""
+
+    def setUp(self) -> None:
+        # Skip __init__, which refuses to run off macOS and creates the folder
+        self.automation = AbletonExportAutomation.__new__(AbletonExportAutomation)
+        self.automation.output_folder = Path('/tmp/My "Stems"')
+
+    def test_export_script_checks_save_dialog_before_select_all(self) -> None:
+        """Cmd+A must only be sent after confirming the Save dialog is in front."""
+        script = _EXPORT_FLOW_SCRIPT.source
+        safety_check = script.index("Not in Save dialog - aborting for safety")
+        select_all = script.index('keystroke "a" using {command down}')
+        self.assertLess(safety_check, select_all)
+
+    @patch("gui_automation._abort_and_escape")
+    @patch("gui_automation.CompiledScript.run")
+    def test_export_track_runs_one_script(self, mock_run: MagicMock, mock_abort: MagicMock) -> None:
+        """export_track should drive the whole dialog flow with one osascript run."""
+        mock_run.return_value = (True, "")
+        self.assertTrue(self.automation.export_track("Lead", filename='Lead "dry"', wait_for_completion=False))
+        mock_run.assert_called_once_with('/tmp/My "Stems"', 'Lead "dry"')
+        mock_abort.assert_not_called()
+
+        mock_run.return_value = (False, "")
+        self.assertFalse(self.automation.export_track("Lead", wait_for_completion=False))
+        mock_abort.assert_called_once()
+
+    @patch("gui_automation._wait_for_export_completion_live12")
+    @patch("gui_automation.wait_for_file_stable")
+    @patch("gui_automation._abort_and_escape")
+    @patch("gui_automation.CompiledScript.run")
+    def test_export_without_save_dialog_is_not_aborted(
+        self,
+        mock_run: MagicMock,
+        mock_abort: MagicMock,
+        mock_wait_file: MagicMock,
+        mock_wait_window: MagicMock,
+    ) -> None:
+        """Live 12 rendering straight away should be waited on, not escaped."""
+        mock_run.return_value = (True, "exporting")
+        self.assertTrue(self.automation.export_track("Lead", export_timeout=30.0))
+        mock_abort.assert_not_called()
+        # Live picks the path itself, so the window is watched, not our file
+        mock_wait_window.assert_called_once_with(max_wait=30)
+        mock_wait_file.assert_not_called()
+
+    @patch("gui_automation.wait_for_file_stable", return_value=True)
+    @patch("gui_automation.CompiledScript.run")
+    def test_saved_export_waits_for_typed_file(self, mock_run: MagicMock, mock_wait: MagicMock) -> None:
+        """After the Save dialog, the file we named is what to wait for."""
+        mock_run.return_value = (True, "saved")
+        self.assertTrue(self.automation.export_track("Lead"))
+        self.assertEqual(mock_wait.call_args.args[0], Path('/tmp/My "Stems"') / "Lead.wav")
+
+    def test_export_script_waits_for_live_before_shortcut(self) -> None:
+        """Cmd+Shift+R must only be sent once Live is frontmost."""
+        script = _EXPORT_FLOW_SCRIPT.source
+        self.assertLess(
+            script.index('frontmost of process "Live"'),
+            script.index('keystroke "r" using {shift down, command down}'),
+        )
+
+
 class TestSelectAllAndDelete(unittest.TestCase):
     """Test that dangerous function is disabled."""
 
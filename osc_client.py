@@ -3,8 +3,10 @@ AbletonOSC client wrapper for communicating with Ableton Live.
 """
 
 import threading
-from dataclasses import dataclass
-from typing import Any, Optional
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
 from pythonosc import udp_client, dispatcher, osc_server
 
 
@@ -16,6 +18,39 @@ class Clip:
     length: float
 
 
+# Tracks fetched per /live/song/get/track_data query; keeps replies well
+# inside a UDP datagram and lets listings start before the whole set is read
+TRACK_BATCH_SIZE = 64
+
+# Bulk track property query; not implemented by older AbletonOSC versions
+TRACK_DATA_ADDRESS = "/live/song/get/track_data"
+
+# Queries with arguments whose replies don't start with those arguments
+UNECHOED_QUERIES = frozenset({TRACK_DATA_ADDRESS})
+
+# Optional queries are tried with a short timeout until one has been
+# answered, and are given up on after this many unanswered tries made while
+# Live was still answering /live/test
+OPTIONAL_PROBE_TIMEOUT = 0.5
+OPTIONAL_MISS_LIMIT = 2
+
+# Argument-less queries whose answers can be reused within a session()
+SESSION_CACHED_QUERIES = frozenset({
+    "/live/song/get/num_tracks",
+    "/live/song/get/tempo",
+    "/live/song/get/signature_numerator",
+    "/live/song/get/signature_denominator",
+})
+
+
+@dataclass
+class _PendingQuery:
+    """A query waiting for its reply."""
+    args: tuple
+    event: threading.Event = field(default_factory=threading.Event)
+    response: Optional[tuple] = None
+
+
 class AbletonOSCClient:
     """
     Client for communicating with Ableton Live via AbletonOSC.
@@ -31,9 +66,19 @@ class AbletonOSCClient:
         # OSC client for sending
         self.client = udp_client.SimpleUDPClient(host, send_port)
 
-        # Response handling
-        self._responses: dict[str, Any] = {}
-        self._response_events: dict[str, threading.Event] = {}
+        # Song-level query results memoized while a session() is open
+        self._session_cache: Optional[dict[str, tuple]] = None
+
+        # Optional queries this AbletonOSC has answered, and those it has
+        # repeatedly left unanswered (not asked again), with the miss counts
+        self._supported: set[str] = set()
+        self._unsupported: set[str] = set()
+        self._optional_misses: dict[str, int] = {}
+
+        # Queries awaiting a reply, oldest first per address. Replies arrive
+        # on the receiver's threads, so access is guarded by the lock.
+        self._pending: dict[str, list[_PendingQuery]] = {}
+        self._pending_lock = threading.Lock()
         self._dispatcher = dispatcher.Dispatcher()
         self._dispatcher.set_default_handler(self._handle_response)
 
@@ -52,10 +97,25 @@ class AbletonOSCClient:
         self._server_thread.start()
 
     def _handle_response(self, address: str, *args):
-        """Handle incoming OSC response."""
-        self._responses[address] = args
-        if address in self._response_events:
-            self._response_events[address].set()
+        """
+        Handle incoming OSC response.
+
+        AbletonOSC echoes the query arguments (track index, clip index, ...)
+        at the start of most replies, so a reply goes to the oldest waiting
+        query whose arguments it starts with. Only replies to UNECHOED_QUERIES
+        fall back to the oldest waiting query for the address; any other
+        unmatched reply is a late answer to a query that timed out, and is
+        dropped rather than handed to a query about another track.
+        """
+        with self._pending_lock:
+            waiting = [p for p in self._pending.get(address, ()) if p.response is None]
+            pending = next((p for p in waiting if args[:len(p.args)] == p.args), None)
+            if pending is None and waiting and address in UNECHOED_QUERIES:
+                pending = waiting[0]
+            if pending is None:
+                return
+            pending.response = args
+        pending.event.set()
 
     def send(self, address: str, *args) -> None:
         """Send an OSC message without waiting for response."""
@@ -73,22 +133,95 @@ class AbletonOSCClient:
         Returns:
             Response tuple or None if timeout
         """
-        # Set up response event
-        event = threading.Event()
-        self._response_events[address] = event
-        self._responses.pop(address, None)
+        memoize = (
+            self._session_cache is not None
+            and not args
+            and address in SESSION_CACHED_QUERIES
+        )
+        if memoize and address in self._session_cache:
+            return self._session_cache[address]
+
+        # Register before sending so a fast reply can't be missed
+        pending = _PendingQuery(args)
+        with self._pending_lock:
+            self._pending.setdefault(address, []).append(pending)
+
+        try:
+            self.client.send_message(address, list(args))
+            if not pending.event.wait(timeout):
+                return None
+        finally:
+            with self._pending_lock:
+                waiters = self._pending[address]
+                waiters.remove(pending)
+                if not waiters:
+                    del self._pending[address]
+
+        if memoize:
+            self._session_cache[address] = pending.response
+        return pending.response
+
+    def query_optional(self, address: str, *args, timeout: float = 2.0) -> Optional[tuple]:
+        """
+        Query an address that older AbletonOSC versions don't implement.
 
-        # Send message
-        self.client.send_message(address, list(args))
+        Until the address has been answered once, it is probed with
+        OPTIONAL_PROBE_TIMEOUT. A probe that goes unanswered while Live still
+        answers /live/test counts as a miss, and after OPTIONAL_MISS_LIMIT
+        misses the address is assumed unsupported: later calls return None
+        straight away. A slow reply while Live is busy never counts.
 
-        # Wait for response
-        if event.wait(timeout):
-            return self._responses.get(address)
-        return None
+        Returns:
+            Response tuple, or None if unsupported or timed out
+        """
+        if address in self._unsupported:
+            return None
+
+        probing = address not in self._supported
+        response = self.query(
+            address, *args, timeout=OPTIONAL_PROBE_TIMEOUT if probing else timeout
+        )
+        if response is not None:
+            self._supported.add(address)
+            self._optional_misses.pop(address, None)
+        elif probing and self.query("/live/test", timeout=OPTIONAL_PROBE_TIMEOUT) is not None:
+            misses = self._optional_misses.get(address, 0) + 1
+            self._optional_misses[address] = misses
+            if misses >= OPTIONAL_MISS_LIMIT:
+                self._unsupported.add(address)
+        return response
+
+    def supports(self, address: str) -> bool:
+        """False once an optional query to address is assumed unsupported."""
+        return address not in self._unsupported
+
+    @contextmanager
+    def session(self) -> Iterator["AbletonOSCClient"]:
+        """
+        Memoize song-level queries (track count, tempo) for the enclosed block.
+
+        Use around a single logical operation that would otherwise ask Live
+        for the same values several times. Sessions may be nested; the
+        cache is dropped when the outermost one exits.
+        """
+        outermost = self._session_cache is None
+        if outermost:
+            self._session_cache = {}
+        try:
+            yield self
+        finally:
+            if outermost:
+                self._session_cache = None
 
     def test_connection(self) -> bool:
         """Test if AbletonOSC is responding."""
         response = self.query("/live/test")
+        if response is None:
+            # Live may come back with a different AbletonOSC, so probe the
+            # optional queries afresh
+            self._supported.clear()
+            self._unsupported.clear()
+            self._optional_misses.clear()
         return response is not None
 
     def close(self):
@@ -98,10 +231,102 @@ class AbletonOSCClient:
 
 
 # Convenience functions
+def try_get_track_count(client: AbletonOSCClient) -> Optional[int]:
+    """Get the number of tracks, or None if AbletonOSC did not respond."""
+    response = client.query("/live/song/get/num_tracks")
+    return response[0] if response else None
+
+
 def get_track_count(client: AbletonOSCClient) -> int:
     """Get the number of tracks in the Live set."""
-    response = client.query("/live/song/get/num_tracks")
-    return response[0] if response else 0
+    count = try_get_track_count(client)
+    return count if count is not None else 0
+
+
+def get_tracks_bulk(
+    client: AbletonOSCClient,
+    start: int,
+    end: int,
+    properties: tuple[str, ...],
+) -> Optional[list[tuple]]:
+    """
+    Get several properties of tracks start..end-1 in a single round-trip.
+
+    Uses AbletonOSC's /live/song/get/track_data, whose response is the
+    requested values flattened track by track.
+
+    Args:
+        client: OSC client to use
+        start: First track index
+        end: Track index to stop before
+        properties: Track property names, e.g. ("name", "mute")
+
+    Returns:
+        One tuple of values per track, in property order, or None if the
+        query is unsupported or went unanswered
+    """
+    response = client.query_optional(
+        TRACK_DATA_ADDRESS, start, end, *(f"track.{p}" for p in properties)
+    )
+    width = len(properties)
+    if not response or len(response) != (end - start) * width:
+        return None
+    return [tuple(response[i:i + width]) for i in range(0, len(response), width)]
+
+
+# Per-track getters used when /live/song/get/track_data is unavailable
+_TRACK_GETTERS = {
+    "name": lambda client, i: get_track_name(client, i),
+    "mute": lambda client, i: get_track_muted(client, i),
+    "is_grouped": lambda client, i: get_track_is_grouped(client, i),
+    "is_foldable": lambda client, i: get_track_is_foldable(client, i),
+}
+
+
+def iter_track_rows(
+    client: AbletonOSCClient,
+    start: int,
+    end: int,
+    properties: tuple[str, ...],
+) -> Iterator[tuple[int, tuple]]:
+    """
+    Yield (index, values) for tracks start..end-1, TRACK_BATCH_SIZE at a time.
+
+    Uses one bulk query per batch; if that goes unanswered (older
+    AbletonOSC), the rest are fetched with one query per property.
+    """
+    for batch_start in range(start, end, TRACK_BATCH_SIZE):
+        batch_end = min(batch_start + TRACK_BATCH_SIZE, end)
+
+        rows = get_tracks_bulk(client, batch_start, batch_end, properties)
+        if rows is None:
+            # Lazily, so a caller that stops early skips the remaining queries
+            getters = [_TRACK_GETTERS[p] for p in properties]
+            rows = (
+                tuple(getter(client, i) for getter in getters)
+                for i in range(batch_start, batch_end)
+            )
+
+        yield from enumerate(rows, batch_start)
+
+
+def bulk_track_data_supported(client: AbletonOSCClient) -> bool:
+    """Whether get_tracks_bulk may work, i.e. it hasn't already gone unanswered."""
+    return client.supports(TRACK_DATA_ADDRESS)
+
+
+def get_all_track_names(client: AbletonOSCClient, track_count: Optional[int] = None) -> list[str]:
+    """
+    Get the names of all tracks, in a single query where AbletonOSC supports it.
+
+    Falls back to one /live/track/get/name query per track.
+    """
+    response = client.query_optional("/live/song/get/track_names")
+    if response is not None:
+        return list(response)
+
+    count = track_count if track_count is not None else get_track_count(client)
+    return [get_track_name(client, i) for i in range(count)]
 
 
 def get_track_name(client: AbletonOSCClient, track_index: int) -> str:
@@ -163,6 +388,22 @@ def get_arrangement_clips(client: AbletonOSCClient, track_index: int) -> list[Cl
     return clips
 
 
+def get_track_audio_bounds(client: AbletonOSCClient, track_index: int) -> Optional[tuple[float, float]]:
+    """
+    Get (start, end) in beats of a track's arrangement clips, or None if it has none.
+
+    Start is the first clip's start and end is the last clip's end. Only
+    start times and lengths are queried; clip names are not fetched.
+    Responses are (track_index, clip1_value, clip2_value, ...).
+    """
+    starts = client.query("/live/track/get/arrangement_clips/start_time", track_index)
+    lengths = client.query("/live/track/get/arrangement_clips/length", track_index)
+
+    if not starts or not lengths or len(starts) < 2 or len(lengths) != len(starts):
+        return None
+    return starts[1], starts[-1] + lengths[-1]
+
+
 def get_session_clips(client: AbletonOSCClient, track_index: int) -> list[dict]:
     """
     Get all session clips for a track.
@@ -193,13 +434,96 @@ def select_track(client: AbletonOSCClient, track_index: int) -> None:
     client.send("/live/view/set/selected_track", track_index)
 
 
+def get_selected_track_index(client: AbletonOSCClient, timeout: float = 2.0) -> Optional[int]:
+    """Get the index of the track selected in the Live UI, or None if unknown."""
+    response = client.query("/live/view/get/selected_track", timeout=timeout)
+    return response[0] if response else None
+
+
+def wait_for_selected_track(
+    client: AbletonOSCClient,
+    track_index: int,
+    timeout: float = 0.3,
+    interval: float = 0.01,
+) -> bool:
+    """
+    Poll until Live reports track_index as selected.
+
+    Args:
+        client: OSC client to use
+        track_index: Track expected to become selected
+        timeout: Maximum time to wait (seconds)
+        interval: Pause between polls (seconds)
+
+    Returns:
+        True if the selection was confirmed before the timeout
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        if get_selected_track_index(client, timeout=remaining) == track_index:
+            return True
+        time.sleep(interval)
+
+
 def set_loop_range(client: AbletonOSCClient, start_beats: float, length_beats: float) -> None:
     """Set the loop/punch range for export."""
     client.send("/live/song/set/loop_start", start_beats)
     client.send("/live/song/set/loop_length", length_beats)
 
 
+def wait_for_loop_range(
+    client: AbletonOSCClient,
+    start_beats: float,
+    length_beats: float,
+    timeout: float = 0.5,
+    interval: float = 0.01,
+) -> bool:
+    """
+    Poll until Live reports the given loop range.
+
+    Args:
+        client: OSC client to use
+        start_beats: Expected loop start in beats
+        length_beats: Expected loop length in beats
+        timeout: Maximum time to wait (seconds)
+        interval: Pause between polls (seconds)
+
+    Returns:
+        True if the loop range was confirmed before the timeout
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        start = client.query("/live/song/get/loop_start", timeout=remaining)
+        length = client.query("/live/song/get/loop_length", timeout=remaining)
+        if (
+            start and length
+            and abs(start[0] - start_beats) < 1e-6
+            and abs(length[0] - length_beats) < 1e-6
+        ):
+            return True
+        time.sleep(interval)
+
+
 def get_tempo(client: AbletonOSCClient) -> float:
     """Get the current tempo."""
     response = client.query("/live/song/get/tempo")
     return response[0] if response else 120.0
+
+
+def get_beats_per_bar(client: AbletonOSCClient) -> float:
+    """
+    Get the length of a bar in beats (quarter notes) from the time signature.
+
+    Falls back to 4/4 for any part of the signature that goes unanswered.
+    """
+    numerator = client.query("/live/song/get/signature_numerator")
+    denominator = client.query("/live/song/get/signature_denominator")
+    beats = numerator[0] if numerator else 4
+    note_value = denominator[0] if denominator else 4
+    return beats * 4 / note_value
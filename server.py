@@ -63,7 +63,9 @@ async def list_tracks(include_clips: bool = False) -> str:
     if not status.connected:
         return status.message
 
-    tracks = get_all_tracks(client, include_clips=include_clips)
+    tracks = get_all_tracks(
+        client, include_clips=include_clips, track_count=status.track_count
+    )
 
     if not tracks:
         return "No tracks found. Is a Live Set open?"
@@ -88,7 +90,9 @@ async def list_groups() -> str:
     if not status.connected:
         return status.message
 
-    groups = get_groups(client)
+    groups = get_groups(
+        client, tracks=get_all_tracks(client, track_count=status.track_count)
+    )
 
     if not groups:
         return "No groups found in this Live Set."
@@ -117,7 +121,7 @@ async def get_track_info(track_index: int) -> str:
     if not status.connected:
         return status.message
 
-    track = get_track_details(client, track_index)
+    track = get_track_details(client, track_index, track_count=status.track_count)
 
     if track is None:
         return f"Invalid track index {track_index}"
@@ -152,7 +156,7 @@ async def find_track(name: str) -> str:
     if not status.connected:
         return status.message
 
-    matches = find_tracks_by_name(client, name)
+    matches = find_tracks_by_name(client, name, track_count=status.track_count)
 
     if not matches:
         return f"No tracks found matching '{name}'"
@@ -184,7 +188,9 @@ async def select_track(track_index: int) -> str:
     if not status.connected:
         return status.message
 
-    success, message = select_track_by_index(client, track_index)
+    success, message = select_track_by_index(
+        client, track_index, track_count=status.track_count
+    )
     return message
 
 
@@ -206,7 +212,7 @@ async def set_loop_range(start_beats: float, length_beats: float) -> str:
     if not status.connected:
         return status.message
 
-    return set_export_range(client, start_beats, length_beats)
+    return set_export_range(client, start_beats, length_beats, tempo=status.tempo)
 
 
 # ===== EXPORT TOOLS (macOS only) =====
@@ -245,6 +251,8 @@ async def export_selected_track(
         client,
         track_index=track_index,
         custom_filename=custom_filename,
+        tempo=status.tempo,
+        track_count=status.track_count,
     )
 
     if result.success:
@@ -271,7 +279,9 @@ async def prepare_for_export(track_index: int) -> str:
     if not status.connected:
         return status.message
 
-    success, message = prepare_track_for_export(client, track_index)
+    success, message = prepare_track_for_export(
+        client, track_index, tempo=status.tempo, track_count=status.track_count
+    )
 
     if success:
         return f"{message}\n\nRun export_selected_track() to export."
@@ -317,6 +327,8 @@ async def full_export(
         track_index=track_index,
         output_folder=output_folder,
         custom_filename=custom_filename,
+        tempo=status.tempo,
+        track_count=status.track_count,
     )
 
     if result.success:
@@ -358,25 +370,33 @@ async def export_full_arrangement(
     if not status.connected:
         return status.message
 
-    # Show detected range first
-    if auto_detect_range:
-        audio_range = get_arrangement_audio_range(client)
-        if audio_range:
-            end_bar = audio_range.start_bar + audio_range.length_bars - 1
-            range_info = (
-                f"Detected audio: bars {audio_range.start_bar}-{end_bar} "
-                f"({audio_range.duration_seconds:.1f}s, {audio_range.length_beats:.0f} beats)\n"
+    # The range detected here is handed to export_arrangement, which then only
+    # reads group names for the key; count and tempo come from the status check
+    with client.session():
+        # Show detected range first
+        if auto_detect_range:
+            audio_range = get_arrangement_audio_range(
+                client, tempo=status.tempo, track_count=status.track_count
             )
+            if audio_range:
+                end_bar = audio_range.start_bar + audio_range.length_bars - 1
+                range_info = (
+                    f"Detected audio: bars {audio_range.start_bar}-{end_bar} "
+                    f"({audio_range.duration_seconds:.1f}s, {audio_range.length_beats:.0f} beats)\n"
+                )
+            else:
+                return "No audio clips found in arrangement"
         else:
-            return "No audio clips found in arrangement"
-    else:
-        range_info = ""
+            range_info = ""
 
-    result = export_arrangement(
-        client,
-        custom_filename=custom_filename,
-        auto_detect_range=auto_detect_range,
-    )
+        result = export_arrangement(
+            client,
+            custom_filename=custom_filename,
+            auto_detect_range=auto_detect_range,
+            audio_range=audio_range if auto_detect_range else None,
+            tempo=status.tempo,
+            track_count=status.track_count,
+        )
 
     if result.success:
         return f"{range_info}✓ {result.message}"
@@ -401,7 +421,9 @@ async def get_audio_range() -> str:
     if not status.connected:
         return status.message
 
-    audio_range = get_arrangement_audio_range(client)
+    audio_range = get_arrangement_audio_range(
+        client, tempo=status.tempo, track_count=status.track_count
+    )
 
     if not audio_range:
         return "No audio clips found in arrangement"
@@ -2,23 +2,24 @@
 Track analyzer for querying Ableton Live session structure.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 from enum import Enum
 
 from osc_client import (
     AbletonOSCClient,
     get_track_count,
-    get_track_name,
-    get_track_muted,
-    get_track_is_grouped,
+    iter_track_rows,
     get_track_group_track_index,
-    get_track_is_foldable,
     get_arrangement_clips,
     get_session_clips,
 )
 
 
+# Track properties read in bulk; the group track and clips are queried per track
+_BULK_PROPERTIES = ("name", "mute", "is_grouped", "is_foldable")
+
+
 class ViewType(Enum):
     ARRANGEMENT = "arrangement"
     SESSION = "session"
@@ -74,6 +75,13 @@ class Group:
     """Represents a group track and its contents."""
     track: Track
     child_tracks: list[Track]
+    # Enabled child tracks that have audio, worked out once when the group is built
+    enabled_tracks_with_audio: list[Track] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.enabled_tracks_with_audio = [
+            t for t in self.child_tracks if t.is_enabled and t.has_audio
+        ]
 
     @property
     def audio_start(self) -> Optional[float]:
@@ -87,11 +95,6 @@ class Group:
         ends = [t.audio_end for t in self.child_tracks if t.audio_end is not None]
         return max(ends) if ends else None
 
-    @property
-    def enabled_tracks_with_audio(self) -> list[Track]:
-        """Get all enabled child tracks that have audio."""
-        return [t for t in self.child_tracks if t.is_enabled and t.has_audio]
-
 
 class TrackAnalyzer:
     """Analyzes the track structure of an Ableton Live set."""
@@ -101,19 +104,25 @@ class TrackAnalyzer:
         self.view = view
         self._tracks: list[Track] = []
         self._groups: list[Group] = []
+        self._track_by_name: dict[str, Track] = {}
+        self._group_by_name: dict[str, Group] = {}
 
     def refresh(self) -> None:
         """Refresh the track list from Live."""
         self._tracks = []
         self._groups = []
+        self._track_by_name = {}
+        self._group_by_name = {}
 
         num_tracks = get_track_count(self.client)
         print(f"Found {num_tracks} tracks")
 
-        # First pass: build all tracks
-        for i in range(num_tracks):
-            track = self._build_track(i)
-            self._tracks.append(track)
+        # First pass: build all tracks, reading their properties in batches
+        rows = iter_track_rows(self.client, 0, num_tracks, _BULK_PROPERTIES)
+        for i, (name, is_muted, is_grouped, is_group) in rows:
+            self._tracks.append(self._make_track(
+                i, name, bool(is_muted), bool(is_grouped), bool(is_group)
+            ))
 
         # Second pass: build groups
         for track in self._tracks:
@@ -121,22 +130,34 @@ class TrackAnalyzer:
                 children = [t for t in self._tracks if t.group_track_index == track.index]
                 self._groups.append(Group(track=track, child_tracks=children))
 
-    def _build_track(self, index: int) -> Track:
-        """Build a Track object from Live data."""
-        name = get_track_name(self.client, index)
-        is_muted = get_track_muted(self.client, index)
-        is_grouped = get_track_is_grouped(self.client, index)
-        group_track_index = get_track_group_track_index(self.client, index)
-        is_group = get_track_is_foldable(self.client, index)
+        # Exact-name lookups; the first track with a given name wins, as in a scan
+        for track in self._tracks:
+            self._track_by_name.setdefault(track.name.lower(), track)
+        for group in self._groups:
+            self._group_by_name.setdefault(group.track.name.lower(), group)
+
+    def _make_track(
+        self,
+        index: int,
+        name: str,
+        is_muted: bool,
+        is_grouped: bool,
+        is_group: bool,
+    ) -> Track:
+        """Build a Track object from already-fetched properties, querying its clips."""
+        # Only tracks inside a group have a group track to look up
+        group_track_index = None
+        if is_grouped:
+            group_track_index = get_track_group_track_index(self.client, index)
 
         # Get clips based on view
         if self.view == ViewType.ARRANGEMENT:
             clip_data = get_arrangement_clips(self.client, index)
             clips = [
                 Clip(
-                    name=c["name"],
-                    start_time=c["start_time"],
-                    length=c["length"],
+                    name=c.name,
+                    start_time=c.start_time,
+                    length=c.length,
                 )
                 for c in clip_data
             ]
@@ -173,16 +194,22 @@ class TrackAnalyzer:
         return self._groups
 
     def find_group_by_name(self, name: str) -> Optional[Group]:
-        """Find a group by name (case-insensitive partial match)."""
+        """Find a group by name (case-insensitive, exact match first, then partial)."""
         name_lower = name.lower()
+        group = self._group_by_name.get(name_lower)
+        if group is not None:
+            return group
         for group in self._groups:
             if name_lower in group.track.name.lower():
                 return group
         return None
 
     def find_track_by_name(self, name: str) -> Optional[Track]:
-        """Find a track by name (case-insensitive partial match)."""
+        """Find a track by name (case-insensitive, exact match first, then partial)."""
         name_lower = name.lower()
+        track = self._track_by_name.get(name_lower)
+        if track is not None:
+            return track
         for track in self._tracks:
             if name_lower in track.name.lower():
                 return track